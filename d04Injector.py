@@ -4,6 +4,7 @@ Katamari DAT Editor - Optimized with Exact Byte Offsets
 ========================================================
 Combines level injection, parameter editing, and lighting editing.
 Uses memory mapping for instant loading and low RAM usage.
+Tk is only imported by main(); open_dat/read_param/write_param work headless.
 
 KNOWN FILE STRUCTURE (hex offsets):
 - <loc> blocks (levels):        0x3D3800 to 0x38FC0685
@@ -25,30 +26,40 @@ JOIN-A-2_C, JOIN-A-2_D, JOIN-A-2_TIME, JOIN-A-3_A, JOIN-A-3_B, JOIN-A-3_C,
 JOIN-A-3_D, JOIN-A-3_E, SELECTMAP_A
 """
 
-import tkinter as tk
-from tkinter import filedialog, colorchooser, messagebox, ttk, scrolledtext
 import os
 import re
+import sys
+import json
 import math
 import mmap
+import hashlib
+import bisect
+import queue
 import threading
+from array import array
+from typing import Final
 
 # =============================================================================
 # CONSTANTS
 # =============================================================================
 
 # Known byte offsets (converted from hex)
-LOC_START = 0x3D3800        # 4012032
-LOC_END = 0x38FC0685        # 956302981 (approx - actual end determined by scanning)
-SMIDATA_START = 0x27A818    # 2598936
-SMIDATA_END = 0x297B78      # 2718584
-SDATA_START = 0x1B7817      # 1800215
-SDATA_END = 0x1B9080        # 1806464
-WARP_START = 0x298017       # 2719767
-WARP_END = 0x2A9958         # 2791768
+LOC_START: Final = 0x3D3800        # 4012032
+LOC_END: Final = 0x38FC0685        # 956302981 (approx - actual end determined by scanning)
+SMIDATA_START: Final = 0x27A818    # 2598936
+SMIDATA_END: Final = 0x297B78      # 2718584
+SDATA_START: Final = 0x1B7817      # 1800215
+SDATA_END: Final = 0x1B9080        # 1806464
+WARP_START: Final = 0x298017       # 2719767
+WARP_END: Final = 0x2A9958         # 2791768
+
+# Scan windows: known region plus slack for blocks that grew past the end
+SMIDATA_SCAN_END: Final = SMIDATA_END + 100000
+SDATA_SCAN_END: Final = SDATA_END + 10000
+WARP_SCAN_END: Final = WARP_END + 5000
 
 # Bonus Categories (0-90)
-BONUS_CATEGORIES = {
+BONUS_CATEGORIES: Final[dict[int, str]] = {
     0: "(None)",
     1: "Veggies", 2: "Fruit", 3: "Food", 4: "Snacks", 5: "Japanese Food",
     6: "Drinks", 7: "Cooking", 8: "Cleaning", 9: "Washing", 10: "Reading",
@@ -69,9 +80,10 @@ BONUS_CATEGORIES = {
     82: "Clouds", 83: "Ocean", 84: "Fantasy", 85: "Antique", 86: "Royal",
     87: "Famous Sites", 88: "World", 89: "Weird Things", 90: "Cosmos"
 }
+BONUS_CATEGORIES_R: Final[dict[str, int]] = {name: cat_id for cat_id, name in BONUS_CATEGORIES.items()}
 
 # SMiData parameter definitions with full documentation
-SMIDATA_PARAMS = {
+SMIDATA_PARAMS: Final[dict[str, dict]] = {
     "c8Code": {"desc": "Internal stage name", "type": "str"},
     "s32Rating_0": {"desc": "Par scores for king rating (6 values). First = minimum clear requirement", "type": "str"},
     "s32Rating_1": {"desc": "Additional rating values (-1 = unused)", "type": "str"},
@@ -170,8 +182,56 @@ SMIDATA_PARAMS = {
     "s8AreaChange": {"desc": "Area change table (3 values)", "type": "str"},
 }
 
-# Level names (index 0 = UNUSED, then 1-83)
-LEVEL_NAMES = [
+# Column view of SMIDATA_PARAMS, built once at import. Per-field lookups are
+# one PARAM_INDEX hit followed by plain tuple/array indexing.
+# Params without a documented range get the full s32 span.
+PARAM_NAMES: Final[tuple[str, ...]] = tuple(SMIDATA_PARAMS)
+PARAM_INDEX: Final[dict[str, int]] = {name: i for i, name in enumerate(PARAM_NAMES)}
+PARAM_DESC: Final[tuple[str, ...]] = tuple(info["desc"] for info in SMIDATA_PARAMS.values())
+PARAM_TYPES: Final[tuple[str, ...]] = tuple(info["type"] for info in SMIDATA_PARAMS.values())
+PARAM_RANGE_LO: Final = array('i', (info.get("range", (-0x80000000, 0))[0] for info in SMIDATA_PARAMS.values()))
+PARAM_RANGE_HI: Final = array('i', (info.get("range", (0, 0x7FFFFFFF))[1] for info in SMIDATA_PARAMS.values()))
+PARAM_OPTIONS: Final[tuple[dict | None, ...]] = tuple(info.get("options") for info in SMIDATA_PARAMS.values())
+
+
+def _option_table(options):
+    """Flatten an int-keyed options dict into (base, labels) so a value maps
+    to labels[value - base]. Gaps are filled with "(unknown)"."""
+    base = min(options)
+    return base, tuple(sys.intern(options.get(i, "(unknown)")) for i in range(base, max(options) + 1))
+
+
+def option_label(table, value):
+    base, labels = table
+    i = value - base
+    if 0 <= i < len(labels):
+        return labels[i]
+    return "(unknown)"
+
+
+# Id-indexed option labels, e.g. BONUS_CATEGORIES_T[12] == "Fashion"
+BONUS_CATEGORIES_T: Final[tuple[str, ...]] = _option_table(BONUS_CATEGORIES)[1]
+PARAM_OPTION_TABLES: Final = tuple(None if opts is None else _option_table(opts) for opts in PARAM_OPTIONS)
+
+# Section headers of the params tab; keys outside every section go last
+PARAM_CATEGORIES: Final[dict[str, tuple[str, ...]]] = {
+    "Basic Info": ("c8Code", "s8Index", "u8Enabled", "s8PlayerNum"),
+    "Scoring": ("s32Rating_0", "s32Rating_1", "s32Rating_2", "s32BonusPoint", "s16BonusCategoryRate"),
+    "Time & Goals": ("f32Time", "s32ShootingStarTime", "u32Target", "f32DispScaleCoef"),
+    "Game Mode": ("u8Proc", "u8Eternal", "u8Modoki", "u8BonusCategory", "u8TgtMonoIdx"),
+    "Display": ("s82dScale", "s82dCore", "s82dOujiBase", "u8UseCore", "u8ViewCore", "u8Scale2d"),
+    "Environment": ("u8Fog", "u8Light", "u8Acc", "u8Camera", "s8Crumble"),
+    "Messages": ("u8GameMessage", "u8LectureMessage", "u8ResultMessage"),
+    "Maps & Scripts": ("u8MapScript_0", "u8MapScript_1", "u8MapScript_2",
+                       "u8LocScript_0", "u8LocScript_1", "u8LocScript_2"),
+    "Other": ("u8Override", "u8Star", "u8NetworkRanking", "u8ClearOnlySpace",
+              "s8Present", "s8ChainEff", "s8SnowFlowerEff", "s16TgtMono",
+              "s16CoreInitID", "u8AriaNum", "s16MonoMdl", "s8Warp", "s8AreaChange")
+}
+PARAM_CATEGORIZED: Final = frozenset(k for keys in PARAM_CATEGORIES.values() for k in keys)
+
+# Level names (index 0 = UNUSED, then 1-83), interned since they key UI lookups
+LEVEL_NAMES: Final[tuple[str, ...]] = tuple(map(sys.intern, (
     "UNUSED",  # Index 0
     "TUTORIAL", "BIG-1_A", "BIG-2_A", "BIG-2_B", "BIG-2_C", "BIG-3_A", "BIG-3_B", "BIG-3_C",
     "BIG-4_A", "BIG-4_B", "BIG-4_C", "BIG-4_D", "BIG-4_TIME", "BIG-5_A", "BIG-5_B", "BIG-5_C",
@@ -188,9 +248,317 @@ LEVEL_NAMES = [
     "JOIN-A-2_A", "JOIN-A-2_B", "JOIN-A-2_C", "JOIN-A-2_D", "JOIN-A-2_TIME",
     "JOIN-A-3_A", "JOIN-A-3_B", "JOIN-A-3_C", "JOIN-A-3_D", "JOIN-A-3_E",
     "SELECTMAP_A"
-]
+)))
+LEVEL_INDEX: Final[dict[str, int]] = {name: i for i, name in enumerate(LEVEL_NAMES)}
+
+EXPECTED_FILE_SIZE: Final = 1629420 * 1024  # 1,668,526,080 bytes
+
+# Level padding goes before the closing tag, which sits at the end of the
+# source; look for it in the tail first
+ENTITY_END_TAG: Final = b'</entityTree>'
+ENTITY_END_TAIL: Final = 4096
+
+# Scan results are cached next to the DAT, keyed by size/mtime/header hash
+SCAN_CACHE_SUFFIX: Final = ".scancache"
+SCAN_CACHE_VERSION: Final = 6
+
+# Entry events that can change its text; any of them marks a field dirty
+EDIT_EVENTS: Final = ("<KeyRelease>", "<<Paste>>", "<<PasteSelection>>", "<<Cut>>")
+
+# Two-digit hex for each 8-bit channel value, used by rgb_to_hex
+_HEX_BYTE: Final = tuple(f"{i:02x}" for i in range(256))
+
+# Warp attributes holding several space-separated components
+WARP_VECTOR_KEYS: Final = ("fvPosi", "f32FadeColor")
+
+# Patterns used by the scanners, compiled once instead of per block. They run
+# on bytes straight from the mmap; only captured names/values get decoded.
+_RE_ATTR_B = re.compile(rb'(\w+)\s*=\s*"([^"]*)"')
+_RE_WARP_ENTRY = re.compile(rb'<(SGiAreaChangeData|SGiMiWarp)\s+([^>]*?)\s*/>')
+_RE_SMIDATA_BLOCK = re.compile(rb'<SMiData.*?/>', re.DOTALL)
+_RE_SDATA_BLOCK = re.compile(rb'<SData.*?/>', re.DOTALL)
+_RE_ROOT_BLOCK = re.compile(rb'<root>.*?</root>', re.DOTALL)
+_ATTR_FINDALL_B = _RE_ATTR_B.findall
+_ATTR_FINDITER_B = _RE_ATTR_B.finditer
+_intern = sys.intern
+
+# Raw attribute name -> interned str. The same few dozen names repeat in
+# every block, so each is decoded once; SMiData names are seeded up front.
+_ATTR_KEYS = {name.encode('ascii'): _intern(name) for name in PARAM_NAMES}
+
+
+def _attr_key(raw):
+    key = _ATTR_KEYS.get(raw)
+    if key is None:
+        key = _ATTR_KEYS[raw] = _intern(raw.decode('ascii'))
+    return key
+
+
+def _parse_attrs(data, pos=0, endpos=sys.maxsize):
+    """key="value" pairs from data[pos:endpos] as (interned key, value) strs.
+    Short values ("0", "-1", flags) are interned too since they repeat."""
+    keys = _ATTR_KEYS
+    pairs = []
+    append = pairs.append
+    for k, v in _ATTR_FINDALL_B(data, pos, endpos):
+        v = v.decode('utf-8', errors='ignore')
+        append((keys.get(k) or _attr_key(k), _intern(v) if len(v) <= 4 else v))
+    return pairs
+
+
+def _parse_attr_spans(data, pos, endpos):
+    """_parse_attrs plus the byte span of each value, relative to pos, so
+    edits can be spliced back without searching the block again"""
+    keys = _ATTR_KEYS
+    attrs = []
+    append = attrs.append
+    for m in _ATTR_FINDITER_B(data, pos, endpos):
+        k, v = m.groups()
+        v = v.decode('utf-8', errors='ignore')
+        v_start, v_end = m.span(2)
+        append((keys.get(k) or _attr_key(k), _intern(v) if len(v) <= 4 else v,
+                v_start - pos, v_end - pos))
+    return attrs
+
+
+def _float_or_none(text):
+    """Finite float value of text, else None"""
+    try:
+        val = float(text)
+    except ValueError:
+        return None
+    return val if math.isfinite(val) else None
+
+
+def _spans_hold(block, raw):
+    """Scanned value spans index the block's bytes; they only hold while
+    raw still covers the whole block"""
+    return len(raw) == block['end'] - block['start']
+
+
+def _splice_values(raw, edits):
+    """Block bytes with (start, end, value) edits applied, as a bytearray.
+    Applied back to front so a length change cannot shift later spans."""
+    buf = bytearray(raw)
+    for start, end, value in sorted(edits, reverse=True):
+        buf[start:end] = value.encode('utf-8')
+    return buf
+
+
+_PARAM_RE_CACHE = {}
+
+
+def _param_pattern(key):
+    """Compiled key="..." value pattern, built once per key. The key is
+    escaped and must start a name, so "Size" never matches "s32CoreSize"."""
+    pattern = _PARAM_RE_CACHE.get(key)
+    if pattern is None:
+        pattern = _PARAM_RE_CACHE[key] = re.compile(f'(?<!\\w)({re.escape(key)}\\s*=\\s*").*?(")')
+    return pattern
+
+
+def _sub_value(text, key, value):
+    """Fallback for text whose value spans are unknown: replace the first
+    key="..." value by search"""
+    m = _param_pattern(key).search(text)
+    if m is None:
+        return text
+    return text[:m.end(1)] + value + text[m.start(2):]
+
+
+def _fit(text, width):
+    """text space padded or truncated to exactly width characters"""
+    return text.ljust(width)[:width]
+
+
+def _fixed_bytes(text, width):
+    """text encoded and space padded or truncated to exactly width bytes,
+    so writing it over a value moves no other offset. Truncation drops whole
+    characters, never half of a multi-byte one."""
+    data = text.encode('utf-8')
+    if len(data) > width:
+        data = data[:width].decode('utf-8', 'ignore').encode('utf-8')
+    return data.ljust(width)
+
+
+def validate_size(path):
+    """Stat-only size check, done before anything is mapped or read.
+    Returns (size, size - EXPECTED_FILE_SIZE). Raises ValueError when the
+    file cannot hold the known regions at all."""
+    size = os.stat(path).st_size
+    if size <= LOC_START:
+        raise ValueError(f"{os.path.basename(path)} is only {size:,} bytes - not a main .dat file")
+    return size, size - EXPECTED_FILE_SIZE
 
-EXPECTED_FILE_SIZE = 1629420 * 1024  # 1,668,526,080 bytes
+
+def _madvise(mm, advice_name, start=0, length=None):
+    """Best-effort mmap access hint. No-op where madvise or the given
+    MADV_* constant is unavailable (e.g. Windows)."""
+    advice = getattr(mmap, advice_name, None)
+    if advice is None or not hasattr(mm, "madvise"):
+        return
+    size = len(mm)
+    if start >= size:
+        return
+    if length is None:
+        length = size - start
+    # madvise requires a page-aligned start
+    aligned = start - (start % mmap.PAGESIZE)
+    length = min(length + (start - aligned), size - aligned)
+    try:
+        mm.madvise(advice, aligned, length)
+    except OSError:
+        pass
+
+
+# =============================================================================
+# HEADLESS API (no Tk required)
+# =============================================================================
+
+def open_dat(path, writable=False):
+    """Map the main DAT for scripted use. The mapping outlives the file
+    handle; the caller closes the returned mmap."""
+    validate_size(path)
+    with open(path, 'r+b' if writable else 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+
+def copy_range(path, dst, start, length):
+    """Copy path[start:start + length] into the open binary file dst.
+    sendfile keeps the bytes in the kernel; where it is missing or refused,
+    the rest is written from a read-only mapping."""
+    offset, end = start, start + length
+    with open(path, 'rb') as src:
+        if hasattr(os, 'sendfile'):
+            dst.flush()
+            try:
+                while offset < end:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, end - offset)
+                    if not sent:
+                        break
+                    offset += sent
+            except OSError:
+                pass
+        if offset < end:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as mv, mv[offset:end] as part:
+                dst.write(part)
+
+
+def write_at(path, offset, data):
+    """Write data at offset in one positional write (os.pwrite), leaving no
+    file position to seek; seek + write where pwrite is missing"""
+    fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+    try:
+        with memoryview(data) as view:
+            done = 0
+            if hasattr(os, 'pwrite'):
+                while done < len(view):
+                    done += os.pwrite(fd, view[done:], offset + done)
+            else:
+                os.lseek(fd, offset, os.SEEK_SET)
+                while done < len(view):
+                    done += os.write(fd, view[done:])
+    finally:
+        os.close(fd)
+
+
+def _find_param(mm, code, key):
+    """Return the (start, end) byte span of key's value in the <SMiData>
+    block whose c8Code is code"""
+    want_code = code.encode('utf-8')
+    want_key = key.encode('utf-8')
+    end_limit = min(SMIDATA_SCAN_END, len(mm))
+    
+    for block in _RE_SMIDATA_BLOCK.finditer(mm, SMIDATA_START, end_limit):
+        is_code = False
+        span = None
+        for m in _RE_ATTR_B.finditer(mm, block.start(), block.end()):
+            k = m.group(1)
+            if k == b"c8Code":
+                is_code = m.group(2) == want_code
+            if k == want_key:
+                span = m.span(2)
+        if is_code:
+            if span is None:
+                raise KeyError(f"{code} has no {key} parameter")
+            return span
+    
+    raise KeyError(f"No <SMiData> block with c8Code={code}")
+
+
+def read_param(mm, code, key):
+    start, end = _find_param(mm, code, key)
+    return mm[start:end].decode('utf-8', errors='ignore')
+
+
+def write_param(mm, code, key, value):
+    """Overwrite a parameter in place (mm must be writable). Like the editor,
+    the value is space-padded or truncated to the original length so the
+    file size never changes. Returns the text actually written."""
+    start, end = _find_param(mm, code, key)
+    length = end - start
+    data = _fixed_bytes(value, length)
+    mm[start:end] = data
+    return data.decode('utf-8', errors='ignore')
+
+
+class SMiDataTable:
+    """Column (SoA) view of the scanned <SMiData> blocks: one list per
+    PARAM_NAMES entry holding each block's raw value (None if absent)"""
+    __slots__ = ("codes", "columns")
+    
+    def __init__(self, blocks):
+        self.codes = [b["code"] for b in blocks]
+        self.columns = {name: [b["params"].get(name) for b in blocks] for name in PARAM_NAMES}
+    
+    def __len__(self):
+        return len(self.codes)
+
+
+class LevelOffsets:
+    """<loc> offsets as parallel array('q') columns. Indexing returns the
+    per-level dict the editor used before, so call sites stay unchanged."""
+    __slots__ = ("loc_start", "content_start", "content_end", "loc_end")
+    
+    def __init__(self, columns=None):
+        for name in self.__slots__:
+            setattr(self, name, array('q', columns[name] if columns else ()))
+    
+    def append(self, loc_start, content_start, content_end, loc_end):
+        self.loc_start.append(loc_start)
+        self.content_start.append(content_start)
+        self.content_end.append(content_end)
+        self.loc_end.append(loc_end)
+    
+    def __len__(self):
+        return len(self.loc_start)
+    
+    def __getitem__(self, i):
+        content_start = self.content_start[i]
+        content_end = self.content_end[i]
+        return {
+            'loc_start': self.loc_start[i],
+            'content_start': content_start,
+            'content_end': content_end,
+            'loc_end': self.loc_end[i],
+            'content_length': content_end - content_start
+        }
+    
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+    
+    def columns(self):
+        """Plain lists per column, for the JSON scan cache"""
+        return {name: getattr(self, name).tolist() for name in self.__slots__}
+
+
+def _init_gui():
+    """Import Tk on demand so headless use never loads Tcl"""
+    global tk, filedialog, colorchooser, messagebox, ttk, scrolledtext, tkfont
+    import tkinter as tk
+    import tkinter.font as tkfont
+    from tkinter import filedialog, colorchooser, messagebox, ttk, scrolledtext
 
 
 # =============================================================================
@@ -206,31 +574,62 @@ class KatamariDatEditor:
         # Main file state
         self.dat_path = None
         self.file_size = 0
+        self.dat_mm = None  # Writable mapping, opened on first injection
+        self._dirty = []  # Sorted, merged (lo, hi) ranges awaiting msync
+        self._flush_job = None
         
         # Level data
-        self.level_offsets = []
+        self.level_offsets = LevelOffsets()
         
         # Lighting data
         self.lighting_blocks = []
         self.current_lighting_block = None
         self.lighting_entries = {}
+        self._lighting_layout = None  # Row layout currently built, see build_lighting_ui
         self.color_buttons = {}
+        self._button_colors = {}  # bg last set on each color button
         self.dir_canvases = {}
         self.dir_sliders = {}
         
         # SMiData (level parameters) data
         self.smidata_blocks = []
+        self.smidata_table = SMiDataTable([])
         self.current_smidata_block = None
         self.smidata_entries = {}
+        self._smidata_layout = None
+        self._smidata_sections = {}
         
         # Warp data
         self.warp_blocks = []
         self.current_warp_block = None
         self.warp_entries = {}
+        # (entry index, fvPosi/f32FadeColor) -> [(widget name, info), ...]
+        self.warp_vectors = {}
+        
+        # Pending mouse wheel scroll, see bind_wheel_scroll
+        self._wheel_delta = 0
+        self._wheel_job = None
+        
+        # Pending debounced callbacks, see debounce
+        self._debounce_jobs = {}
+        
+        # Log lines from worker threads, flushed to the log tab every 50 ms
+        self._log_queue = queue.SimpleQueue()
         
         self.create_ui()
+        self.root.after(50, self._drain_log)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        self.close_dat()
+        self.root.destroy()
     
     def create_ui(self):
+        # Named fonts for the entry rows: every Entry refers to one font
+        # object instead of passing its own description to resolve
+        self.font_entry = tkfont.Font(root=self.root, family="Consolas", size=9)
+        self.font_entry_small = tkfont.Font(root=self.root, family="Consolas", size=8)
+        
         # ===== TOP BAR =====
         top_frame = tk.Frame(self.root, bg="#444", pady=8)
         top_frame.pack(fill=tk.X)
@@ -244,6 +643,7 @@ class KatamariDatEditor:
         tk.Button(top_frame, text="Load .dat", command=self.load_dat_file).pack(side=tk.LEFT, padx=5)
         self.btn_scan = tk.Button(top_frame, text="Scan All", command=self.start_scan_thread, state="disabled")
         self.btn_scan.pack(side=tk.LEFT, padx=5)
+        tk.Button(top_frame, text="Inject All Pending", command=self.inject_all_pending).pack(side=tk.LEFT, padx=5)
         
         self.lbl_status = tk.Label(top_frame, text="Ready", fg="#0f0", bg="#444", font=("Consolas", 9))
         self.lbl_status.pack(side=tk.RIGHT, padx=10)
@@ -260,19 +660,40 @@ class KatamariDatEditor:
         
         self.tab_params = tk.Frame(self.notebook)
         self.notebook.add(self.tab_params, text="  Level Parameters  ")
-        self.create_params_tab()
         
         self.tab_lighting = tk.Frame(self.notebook)
         self.notebook.add(self.tab_lighting, text="  Lighting Editor  ")
-        self.create_lighting_tab()
         
         self.tab_warp = tk.Frame(self.notebook)
         self.notebook.add(self.tab_warp, text="  Area Changes  ")
-        self.create_warp_tab()
         
         self.tab_log = tk.Frame(self.notebook)
         self.notebook.add(self.tab_log, text="  Log  ")
         self.create_log_tab()
+        
+        # Editor tabs are built (and filled with scan results) the first
+        # time they are shown
+        self._tab_builders = {
+            str(self.tab_params): self.create_params_tab,
+            str(self.tab_lighting): self.create_lighting_tab,
+            str(self.tab_warp): self.create_warp_tab,
+        }
+        self._tab_populators = {
+            str(self.tab_params): self.populate_smidata_combo,
+            str(self.tab_lighting): self.populate_lighting_combo,
+            str(self.tab_warp): self.populate_warp_combo,
+        }
+        self._regions_scanned = False
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_shown)
+    
+    def _on_tab_shown(self, event):
+        tab = self.notebook.select()
+        builder = self._tab_builders.pop(tab, None)
+        if builder is None:
+            return
+        builder()
+        if self._regions_scanned:
+            self._tab_populators[tab]()
     
     def create_level_tab(self):
         pane = tk.PanedWindow(self.tab_levels, orient=tk.HORIZONTAL, sashwidth=5)
@@ -364,23 +785,13 @@ class KatamariDatEditor:
         self.param_canvas = tk.Canvas(container)
         self.param_scrollbar = tk.Scrollbar(container, orient="vertical", 
                                              command=self.param_canvas.yview)
-        self.param_scroll_frame = tk.Frame(self.param_canvas)
-        
-        self.param_scroll_frame.bind(
-            "<Configure>",
-            lambda e: self.param_canvas.configure(scrollregion=self.param_canvas.bbox("all"))
-        )
-        
-        self.param_canvas.create_window((0, 0), window=self.param_scroll_frame, anchor="nw")
+        self.param_scroll_frame = self.new_scroll_frame(self.param_canvas)
         self.param_canvas.configure(yscrollcommand=self.param_scrollbar.set)
         
         self.param_canvas.pack(side="left", fill="both", expand=True)
         self.param_scrollbar.pack(side="right", fill="y")
         
-        # Mouse wheel scrolling
-        def on_mousewheel(event):
-            self.param_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        self.param_canvas.bind_all("<MouseWheel>", on_mousewheel)
+        self.bind_wheel_scroll(self.param_canvas)
     
     def create_lighting_tab(self):
         top = tk.Frame(self.tab_lighting)
@@ -403,18 +814,13 @@ class KatamariDatEditor:
         self.light_canvas = tk.Canvas(container)
         self.light_scrollbar = tk.Scrollbar(container, orient="vertical", 
                                              command=self.light_canvas.yview)
-        self.light_scroll_frame = tk.Frame(self.light_canvas)
-        
-        self.light_scroll_frame.bind(
-            "<Configure>",
-            lambda e: self.light_canvas.configure(scrollregion=self.light_canvas.bbox("all"))
-        )
-        
-        self.light_canvas.create_window((0, 0), window=self.light_scroll_frame, anchor="nw")
+        self.light_scroll_frame = self.new_scroll_frame(self.light_canvas)
         self.light_canvas.configure(yscrollcommand=self.light_scrollbar.set)
         
         self.light_canvas.pack(side="left", fill="both", expand=True)
         self.light_scrollbar.pack(side="right", fill="y")
+        
+        self.bind_wheel_scroll(self.light_canvas)
     
     def create_warp_tab(self):
         top = tk.Frame(self.tab_warp)
@@ -454,29 +860,90 @@ class KatamariDatEditor:
         self.warp_canvas = tk.Canvas(container)
         self.warp_scrollbar = tk.Scrollbar(container, orient="vertical", 
                                             command=self.warp_canvas.yview)
-        self.warp_scroll_frame = tk.Frame(self.warp_canvas)
-        
-        self.warp_scroll_frame.bind(
-            "<Configure>",
-            lambda e: self.warp_canvas.configure(scrollregion=self.warp_canvas.bbox("all"))
-        )
-        
-        self.warp_canvas.create_window((0, 0), window=self.warp_scroll_frame, anchor="nw")
+        self.warp_scroll_frame = self.new_scroll_frame(self.warp_canvas)
         self.warp_canvas.configure(yscrollcommand=self.warp_scrollbar.set)
         
         self.warp_canvas.pack(side="left", fill="both", expand=True)
         self.warp_scrollbar.pack(side="right", fill="y")
+        
+        self.bind_wheel_scroll(self.warp_canvas)
+    
+    def new_scroll_frame(self, canvas, old=None):
+        """Content frame shown inside a scrolling canvas. Passing the frame
+        it replaces drops that frame and all its rows in one destroy."""
+        frame = tk.Frame(canvas)
+        frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        if old is None:
+            canvas.create_window((0, 0), window=frame, anchor="nw", tags="content")
+        else:
+            canvas.itemconfigure("content", window=frame)
+            old.destroy()
+        return frame
+    
+    def bind_wheel_scroll(self, canvas):
+        """Wheel-scroll canvas only while the pointer is over it. Deltas that
+        arrive within one event-loop pass are coalesced into one scroll."""
+        def on_wheel(event):
+            if event.num == 4:
+                delta = 120
+            elif event.num == 5:
+                delta = -120
+            else:
+                delta = event.delta
+            self._wheel_delta += delta
+            if self._wheel_job is None:
+                self._wheel_job = self.root.after_idle(self._flush_wheel, canvas)
+        
+        def on_enter(event):
+            for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                canvas.bind_all(seq, on_wheel)
+        
+        def on_leave(event):
+            for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                canvas.unbind_all(seq)
+        
+        canvas.bind("<Enter>", on_enter)
+        canvas.bind("<Leave>", on_leave)
+    
+    def _flush_wheel(self, canvas):
+        self._wheel_job = None
+        units = int(-self._wheel_delta / 120)
+        self._wheel_delta += units * 120
+        if units:
+            canvas.yview_scroll(units, "units")
+    
+    def debounce(self, key, delay, func, *args):
+        """Run func(*args) once calls with this key pause for delay ms;
+        each call replaces the one still pending"""
+        job = self._debounce_jobs.pop(key, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        
+        def run():
+            self._debounce_jobs.pop(key, None)
+            func(*args)
+        
+        self._debounce_jobs[key] = self.root.after(delay, run)
     
     def create_log_tab(self):
         self.log_text = scrolledtext.ScrolledText(self.tab_log, font=("Consolas", 9))
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
     
     def log(self, msg):
-        # Thread-safe logging
-        def do_log():
-            self.log_text.insert(tk.END, msg + "\n")
+        # Thread-safe logging: queued here, drained on the Tk thread
+        self._log_queue.put(msg)
+    
+    def _drain_log(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
             self.log_text.see(tk.END)
-        self.root.after(0, do_log)
+        self.root.after(50, self._drain_log)
     
     # =========================================================================
     # FILE LOADING
@@ -490,24 +957,94 @@ class KatamariDatEditor:
         if not path:
             return
         
+        try:
+            self.file_size, diff = validate_size(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            self.log(f"ERROR: {e}")
+            return
+        
+        self.close_dat()
         self.dat_path = path
-        self.file_size = os.path.getsize(path)
         size_kb = self.file_size // 1024
         
         self.lbl_file.config(text=os.path.basename(path), fg="white")
         self.btn_scan.config(state="normal")
         
-        if self.file_size == EXPECTED_FILE_SIZE:
+        if diff == 0:
             self.lbl_status.config(text=f"✓ {size_kb:,} KB (exact)", fg="#0f0")
             self.log(f"Loaded: {path}")
             self.log(f"Size: {self.file_size:,} bytes - EXACT MATCH")
         else:
-            diff = self.file_size - EXPECTED_FILE_SIZE
             self.lbl_status.config(text=f"⚠ {size_kb:,} KB (diff: {diff:+,})", fg="orange")
             self.log(f"WARNING: Size differs by {diff:+,} bytes")
         
         self.log("Ready to scan. Press 'Scan All'.")
     
+    def get_dat_mm(self):
+        """Writable mapping of the main DAT. Edits land in the page cache and
+        only the touched pages are written back."""
+        if self.dat_mm is None:
+            self.dat_mm = open_dat(self.dat_path, writable=True)
+            # Edits touch a few scattered slots; readahead would be wasted
+            _madvise(self.dat_mm, "MADV_RANDOM")
+        return self.dat_mm
+    
+    def block_bytes(self, block):
+        """Bytes of a scanned block, read from the DAT on demand. Scans only
+        record offsets and nothing keeps a copy, so after an inject this
+        reads back exactly what was written."""
+        start, end = block["start"], block["end"]
+        if self.dat_mm is not None:
+            return self.dat_mm[start:end]
+        with open(self.dat_path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+    
+    def block_text(self, block):
+        return self.block_bytes(block).decode('utf-8', errors='ignore')
+    
+    def patch_dat(self, start, data):
+        """Overwrite data in place through the edit mapping; only the
+        touched pages are queued for write-back"""
+        self.get_dat_mm()[start:start + len(data)] = data
+        self.mark_dirty(start, len(data))
+    
+    def mark_dirty(self, start, length):
+        """Queue [start, start + length) for msync. Touching ranges are merged
+        and flushed together after a short debounce."""
+        lo, hi = start, start + length
+        dirty = self._dirty
+        i = bisect.bisect_left(dirty, (lo, lo))
+        if i and dirty[i - 1][1] >= lo:
+            i -= 1
+            lo = dirty[i][0]
+        j = i
+        while j < len(dirty) and dirty[j][0] <= hi:
+            hi = max(hi, dirty[j][1])
+            j += 1
+        dirty[i:j] = [(lo, hi)]
+        
+        if self._flush_job is None:
+            self._flush_job = self.root.after(100, self.flush_dirty)
+    
+    def flush_dirty(self):
+        self._flush_job = None
+        if self.dat_mm is not None:
+            gran = mmap.ALLOCATIONGRANULARITY
+            for lo, hi in self._dirty:
+                aligned = lo - (lo % gran)
+                self.dat_mm.flush(aligned, hi - aligned)
+        self._dirty.clear()
+    
+    def close_dat(self):
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+        self.flush_dirty()
+        if self.dat_mm is not None:
+            self.dat_mm.close()
+            self.dat_mm = None
+    
     def start_scan_thread(self):
         self.btn_scan.config(state="disabled")
         self.progress.pack(side=tk.RIGHT, padx=5)
@@ -519,11 +1056,32 @@ class KatamariDatEditor:
     
     def scan_all_worker(self):
         try:
+            validate_size(self.dat_path)
             with open(self.dat_path, 'rb') as f:
                 with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                    self.log("Scanning Levels (<loc>) starting from known offset...")
-                    self.scan_levels_mmap(mm)
+                    st = os.fstat(f.fileno())
+                    cache_key = [st.st_size, st.st_mtime_ns,
+                                 hashlib.blake2b(mm[:65536], digest_size=16).hexdigest(),
+                                 SCAN_CACHE_VERSION]
+                    if self.load_scan_cache(cache_key):
+                        self.log("Unchanged since last scan - loaded results from cache")
+                        self.root.after(0, self.populate_region_tabs)
+                        self.root.after(0, self.finish_scan)
+                        return
+                    
+                    # Every scan walks its region front to back: ask for
+                    # aggressive readahead, and have the kernel prefetch all
+                    # four regions concurrently while Python parses them in
+                    # turn (mm.find / re hold the GIL, so threads can't)
+                    regions = ((SMIDATA_START, SMIDATA_SCAN_END), (SDATA_START, SDATA_SCAN_END),
+                               (WARP_START, WARP_SCAN_END), (LOC_START, LOC_END))
+                    for lo, hi in regions:
+                        _madvise(mm, "MADV_SEQUENTIAL", lo, hi - lo)
+                    for lo, hi in regions:
+                        _madvise(mm, "MADV_WILLNEED", lo, hi - lo)
                     
+                    # Small windows first so their tabs are usable while the
+                    # ~950 MB level region is still being scanned
                     self.log("Scanning Parameters (<SMiData>) in known range...")
                     self.scan_smidata_mmap(mm)
                     
@@ -532,7 +1090,13 @@ class KatamariDatEditor:
                     
                     self.log("Scanning Warp Data (<SWarpData>) in known range...")
                     self.scan_warp_mmap(mm)
+                    
+                    self.root.after(0, self.populate_region_tabs)
+                    
+                    self.log("Scanning Levels (<loc>) starting from known offset...")
+                    self.scan_levels_mmap(mm)
             
+            self.save_scan_cache(cache_key)
             self.root.after(0, self.finish_scan)
             
         except Exception as e:
@@ -542,6 +1106,44 @@ class KatamariDatEditor:
             self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
             self.root.after(0, self.stop_progress)
     
+    def load_scan_cache(self, key):
+        try:
+            with open(self.dat_path + SCAN_CACHE_SUFFIX, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(cache, dict) or cache.get("key") != key:
+            return False
+        
+        self.level_offsets = LevelOffsets(cache["levels"])
+        self.smidata_blocks = cache["smidata"]
+        self.smidata_table = SMiDataTable(self.smidata_blocks)
+        self.lighting_blocks = cache["lighting"]
+        self.warp_blocks = cache["warp"]
+        return True
+    
+    def save_scan_cache(self, key):
+        cache_path = self.dat_path + SCAN_CACHE_SUFFIX
+        try:
+            with open(cache_path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump({
+                    "key": key,
+                    "levels": self.level_offsets.columns(),
+                    "smidata": self.smidata_blocks,
+                    "lighting": self.lighting_blocks,
+                    "warp": self.warp_blocks
+                }, f)
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError as e:
+            self.log(f"  (scan cache not saved: {e})")
+    
+    def invalidate_scan_cache(self):
+        """Drop the cache after any write; cached block params would be stale"""
+        try:
+            os.remove(self.dat_path + SCAN_CACHE_SUFFIX)
+        except OSError:
+            pass
+    
     def stop_progress(self):
         self.progress.stop()
         self.progress.pack_forget()
@@ -553,26 +1155,38 @@ class KatamariDatEditor:
         
         self.refresh_level_list()
         
+        self.log(f"Scan Complete: {len(self.level_offsets)} levels, {len(self.smidata_blocks)} params, {len(self.lighting_blocks)} lighting, {len(self.warp_blocks)} warps")
+    
+    def populate_region_tabs(self):
+        """Fill the lighting/params/warp selectors once their regions are
+        scanned. Tabs not built yet are filled when first shown."""
+        self._regions_scanned = True
+        for tab, populate in self._tab_populators.items():
+            if tab not in self._tab_builders:
+                populate()
+    
+    def populate_lighting_combo(self):
         stages = [b["stage"] for b in self.lighting_blocks]
         self.stage_combo.config(values=stages, state="readonly")
         if stages:
             self.stage_combo.current(0)
             self.on_stage_change(None)
-        
-        codes = [f"{b['code']} (idx:{b['params'].get('s8Index', '?')})" for b in self.smidata_blocks]
+    
+    def populate_smidata_combo(self):
+        table = self.smidata_table
+        codes = [f"{code} (idx:{'?' if idx is None else idx})"
+                 for code, idx in zip(table.codes, table.columns["s8Index"])]
         self.smidata_combo.config(values=codes, state="readonly")
         if codes:
             self.smidata_combo.current(0)
             self.on_smidata_change(None)
-        
-        # Populate warp combo
+    
+    def populate_warp_combo(self):
         warp_names = [f"{b['name']} ({len(b['params'])} params)" for b in self.warp_blocks]
         self.warp_combo.config(values=warp_names, state="readonly")
         if warp_names:
             self.warp_combo.current(0)
             self.on_warp_change(None)
-        
-        self.log(f"Scan Complete: {len(self.level_offsets)} levels, {len(self.smidata_blocks)} params, {len(self.lighting_blocks)} lighting, {len(self.warp_blocks)} warps")
     
     # =========================================================================
     # SCANNING FUNCTIONS (Using known offsets for efficiency)
@@ -580,37 +1194,36 @@ class KatamariDatEditor:
     
     def scan_levels_mmap(self, mm):
         """Scan for <loc>...</loc> blocks starting from known offset"""
-        self.level_offsets = []
+        self.level_offsets = LevelOffsets()
         
         loc_start_sig = b'<loc>'
         loc_end_sig = b'</loc>'
+        start_len = len(loc_start_sig)
+        end_len = len(loc_end_sig)
+        
+        # Hot loop over ~950 MB: bind lookups to locals once
+        find = mm.find
+        append = self.level_offsets.append
+        size = len(mm)
         
         # Start scanning from known loc region
         pos = LOC_START
         count = 0
         
-        while pos < len(mm):
-            start = mm.find(loc_start_sig, pos)
+        while pos < size:
+            start = find(loc_start_sig, pos)
             if start == -1:
                 break
             
-            end = mm.find(loc_end_sig, start)
+            content_start = start + start_len
+            end = find(loc_end_sig, content_start)
             if end == -1:
                 break
             
-            content_start = start + len(loc_start_sig)
-            content_end = end
-            
-            self.level_offsets.append({
-                'loc_start': start,
-                'content_start': content_start,
-                'content_end': content_end,
-                'loc_end': end + len(loc_end_sig),
-                'content_length': content_end - content_start
-            })
+            pos = end + end_len
+            append(start, content_start, end, pos)
             
             count += 1
-            pos = end + len(loc_end_sig)
             
             # Log progress every 10 levels
             if count % 10 == 0:
@@ -622,35 +1235,20 @@ class KatamariDatEditor:
         """Scan for <SMiData.../> blocks in known range"""
         self.smidata_blocks = []
         
-        start_sig = b'<SMiData'
-        end_sig = b'/>'
-        
-        # Scan within known SMiData region for efficiency
-        pos = SMIDATA_START
-        end_limit = min(SMIDATA_END + 100000, len(mm))  # Some buffer
+        # Single regex pass over the known SMiData region
+        end_limit = min(SMIDATA_SCAN_END, len(mm))
         
-        while pos < end_limit:
-            start = mm.find(start_sig, pos)
-            if start == -1 or start > end_limit:
-                break
-            
-            end = mm.find(end_sig, start)
-            if end == -1:
-                break
-            
-            block_end = end + len(end_sig)
-            block_bytes = mm[start:block_end]
-            
-            try:
-                block_text = block_bytes.decode('utf-8', errors='ignore')
-            except:
-                block_text = block_bytes.decode('latin-1')
+        # Attributes are matched in place, bounded by each block's span
+        for match in _RE_SMIDATA_BLOCK.finditer(mm, SMIDATA_START, end_limit):
+            start, block_end = match.span()
             
             params = {}
+            spans = {}
             code = "Unknown"
             
-            for k, v in re.findall(r'(\w+)\s*=\s*"(.*?)"', block_text):
+            for k, v, v_start, v_end in _parse_attr_spans(mm, start, block_end):
                 params[k] = v
+                spans.setdefault(k, (v_start, v_end))
                 if k == "c8Code":
                     code = v
             
@@ -658,48 +1256,27 @@ class KatamariDatEditor:
                 "code": code,
                 "start": start,
                 "end": block_end,
-                "text": block_text,
-                "params": params
+                "params": params,
+                "spans": spans
             })
-            
-            pos = block_end
         
+        self.smidata_table = SMiDataTable(self.smidata_blocks)
         self.log(f"  Total: {len(self.smidata_blocks)} <SMiData> blocks found")
     
     def scan_lighting_mmap(self, mm):
         """Scan for <SData.../> blocks in known range"""
         self.lighting_blocks = []
         
-        start_sig = b'<SData'
-        end_sig = b'/>'
+        # Single regex pass over the known SData region
+        end_limit = min(SDATA_SCAN_END, len(mm))
         
-        # Scan within known SData region
-        pos = SDATA_START
-        end_limit = min(SDATA_END + 10000, len(mm))
-        
-        while pos < end_limit:
-            start = mm.find(start_sig, pos)
-            if start == -1 or start > end_limit:
-                break
-            
-            end = mm.find(end_sig, start)
-            if end == -1:
-                break
-            
-            block_end = end + len(end_sig)
-            block_bytes = mm[start:block_end]
-            
-            try:
-                block_text = block_bytes.decode('utf-8', errors='ignore')
-            except:
-                block_text = block_bytes.decode('latin-1')
-            
-            inner = block_text
+        for match in _RE_SDATA_BLOCK.finditer(mm, SDATA_START, end_limit):
+            start, block_end = match.span()
             
             params = []
             stage = "Unknown"
             
-            for k, v in re.findall(r'(\w+)\s*=\s*"(.*?)"', inner):
+            for k, v, v_start, v_end in _parse_attr_spans(mm, start, block_end):
                 if k == "Stage":
                     stage = v
                 parts = v.split()
@@ -707,6 +1284,7 @@ class KatamariDatEditor:
                     "key": k,
                     "original": v,
                     "parts": parts,
+                    "span": (v_start, v_end),
                     "is_color": ("Color" in k or k == "Ambient"),
                     "is_dir": ("Dir" in k and len(parts) == 3)
                 })
@@ -715,11 +1293,8 @@ class KatamariDatEditor:
                 "stage": stage,
                 "start": start,
                 "end": block_end,
-                "text": block_text,
                 "params": params
             })
-            
-            pos = block_end
         
         self.log(f"  Total: {len(self.lighting_blocks)} <SData> blocks found")
     
@@ -737,110 +1312,78 @@ class KatamariDatEditor:
         """
         self.warp_blocks = []
         
-        root_start_sig = b'<root>'
-        root_end_sig = b'</root>'
+        end_limit = min(WARP_SCAN_END, len(mm))
         
-        pos = WARP_START
-        end_limit = min(WARP_END + 5000, len(mm))
-        
-        block_count = 0
-        
-        while pos < end_limit:
-            root_start = mm.find(root_start_sig, pos)
-            if root_start == -1 or root_start > end_limit:
-                break
-            
-            root_end = mm.find(root_end_sig, root_start)
-            if root_end == -1:
-                break
-            
-            root_end = root_end + len(root_end_sig)
-            
-            block_bytes = mm[root_start:root_end]
-            
-            try:
-                block_text = block_bytes.decode('utf-8', errors='ignore')
-            except:
-                block_text = block_bytes.decode('latin-1')
+        for block_count, root_match in enumerate(_RE_ROOT_BLOCK.finditer(mm, WARP_START, end_limit)):
+            root_start, root_end = root_match.span()
             
             # Look for comment above identifying the level
-            search_start = max(0, root_start - 200)
-            prefix_bytes = mm[search_start:root_start]
-            try:
-                prefix_text = prefix_bytes.decode('utf-8', errors='ignore')
-            except:
-                prefix_text = prefix_bytes.decode('latin-1')
-            
-            comment_match = re.search(r'<!--\s*(\S+)\s*-->', prefix_text)
-            if comment_match:
-                block_name = comment_match.group(1)
-            else:
+            block_name = None
+            c_start = mm.rfind(b'<!--', max(0, root_start - 200), root_start)
+            if c_start != -1:
+                c_end = mm.find(b'-->', c_start + 4, root_start)
+                if c_end != -1:
+                    name = mm[c_start + 4:c_end].split()
+                    if len(name) == 1:
+                        block_name = name[0].decode('utf-8', errors='ignore')
+            if block_name is None:
                 block_name = f"Block_{block_count}"
             
-            # Determine block type and parse entries
-            entries = []
-            block_type = "unknown"
+            # One pass picks up both SGiAreaChangeData and SGiMiWarp entries;
+            # area changes are still listed first
+            area_changes = []
+            warps = []
+            for entry_match in _RE_WARP_ENTRY.finditer(mm, root_start, root_end):
+                is_area = entry_match.group(1) == b'SGiAreaChangeData'
+                attr_start, attr_end = entry_match.span(2)
+                shift = attr_start - root_start
+                params = {}
+                spans = {}
+                for key, val, vs, ve in _parse_attr_spans(mm, attr_start, attr_end):
+                    params[key] = val
+                    spans[key] = (vs + shift, ve + shift)
+                (area_changes if is_area else warps).append({
+                    "params": params,
+                    # Value offsets into the block, for splicing edits back in
+                    "spans": spans,
+                    "parts": {k: tuple(params[k].split()) for k in WARP_VECTOR_KEYS if k in params},
+                    "type": "area_change" if is_area else "warp"
+                })
             
-            # Check for SGiAreaChangeData entries
-            area_change_matches = list(re.finditer(r'<SGiAreaChangeData\s+(.*?)\s*/>', block_text, re.DOTALL))
-            if area_change_matches:
+            # Determine block type
+            if area_changes and warps:
+                block_type = "mixed"
+            elif area_changes:
                 block_type = "area_change"
-                for entry_match in area_change_matches:
-                    entry_text = entry_match.group(0)
-                    entry_inner = entry_match.group(1)
-                    
-                    entry_params = {}
-                    for k, v in re.findall(r'(\w+)\s*=\s*"(.*?)"', entry_inner):
-                        entry_params[k] = v
-                    
-                    entries.append({
-                        "text": entry_text,
-                        "params": entry_params,
-                        "type": "area_change"
-                    })
-            
-            # Check for SGiMiWarp entries
-            warp_matches = list(re.finditer(r'<SGiMiWarp\s+(.*?)\s*/>', block_text, re.DOTALL))
-            if warp_matches:
-                block_type = "warp" if not area_change_matches else "mixed"
-                for entry_match in warp_matches:
-                    entry_text = entry_match.group(0)
-                    entry_inner = entry_match.group(1)
-                    
-                    entry_params = {}
-                    for k, v in re.findall(r'(\w+)\s*=\s*"(.*?)"', entry_inner):
-                        entry_params[k] = v
-                    
-                    entries.append({
-                        "text": entry_text,
-                        "params": entry_params,
-                        "type": "warp"
-                    })
+            elif warps:
+                block_type = "warp"
+            else:
+                block_type = "unknown"
+            entries = area_changes + warps
             
             self.warp_blocks.append({
                 "name": block_name,
                 "start": root_start,
                 "end": root_end,
-                "text": block_text,
-                "prefix": prefix_text if comment_match else "",
                 "entries": entries,
                 "block_type": block_type,
                 "params": {}
             })
-            
-            block_count += 1
-            pos = root_end
         
         self.log(f"  Total: {len(self.warp_blocks)} area/warp block(s) found")
     
     def refresh_level_list(self):
-        self.level_listbox.delete(0, tk.END)
+        # Listbox only draws visible lines; fill it with one Tcl call
+        rows = []
         for i, info in enumerate(self.level_offsets):
             if i < len(LEVEL_NAMES):
                 name = LEVEL_NAMES[i]
             else:
                 name = f"(EXTRA #{i})"
-            self.level_listbox.insert(tk.END, f"[{i}] {name} - {info['content_length']:,} bytes")
+            rows.append(f"[{i}] {name} - {info['content_length']:,} bytes")
+        self.level_listbox.delete(0, tk.END)
+        if rows:
+            self.level_listbox.insert(tk.END, *rows)
     
     # =========================================================================
     # LEVEL OPERATIONS
@@ -888,14 +1431,13 @@ Content Length: {info['content_length']:,} bytes""")
         if not save_path:
             return
         
-        with open(self.dat_path, 'rb') as f:
-            f.seek(info['content_start'])
-            content = f.read(info['content_length'])
-        
+        # Copied file-to-file, no intermediate read buffer. Edits made
+        # through the shared mapping are already in the page cache.
+        length = info['content_length']
         with open(save_path, 'wb') as f:
-            f.write(content)
+            copy_range(self.dat_path, f, info['content_start'], length)
         
-        self.log(f"Extracted {name} ({len(content):,} bytes) -> {save_path}")
+        self.log(f"Extracted {name} ({length:,} bytes) -> {save_path}")
         messagebox.showinfo("Success", f"Extracted to:\n{save_path}")
     
     def inject_level(self, from_text=False):
@@ -919,10 +1461,8 @@ Content Length: {info['content_length']:,} bytes""")
         if not source_path:
             return
         
-        with open(source_path, 'rb') as f:
-            new_content = f.read()
-        
-        new_length = len(new_content)
+        # Size check via stat so oversized sources are rejected unread
+        new_length = os.stat(source_path).st_size
         
         self.log(f"Source: {new_length:,} bytes | Target: {original_length:,} bytes")
         
@@ -934,24 +1474,31 @@ Content Length: {info['content_length']:,} bytes""")
                 "Cannot inject.")
             return
         
-        # Pad if needed
-        if new_length < original_length:
-            diff = original_length - new_length
+        # Read straight into a slot-sized buffer; padding is filled in place,
+        # so the buffer is always exactly original_length long
+        new_content = bytearray(original_length)
+        with open(source_path, 'rb') as f:
+            new_length = f.readinto(new_content)
+            grew = new_length == original_length and f.read(1)
+        
+        if grew:
+            messagebox.showerror("Error", "Source file grew while reading. Cannot inject.")
+            return
+        
+        diff = original_length - new_length
+        if diff > 0:
             self.log(f"Padding with {diff:,} spaces")
             
+            end_pos = -1
             if self.pad_mode.get() == "spaces_end":
-                end_tag = b'</entityTree>'
-                end_pos = new_content.rfind(end_tag)
-                if end_pos != -1:
-                    new_content = new_content[:end_pos] + (b' ' * diff) + new_content[end_pos:]
-                else:
-                    new_content = new_content + (b' ' * diff)
+                end_pos = new_content.rfind(ENTITY_END_TAG, max(0, new_length - ENTITY_END_TAIL), new_length)
+                if end_pos == -1:
+                    end_pos = new_content.rfind(ENTITY_END_TAG, 0, new_length)
+            if end_pos == -1:
+                end_pos = new_length
             else:
-                new_content = new_content + (b' ' * diff)
-        
-        if len(new_content) != original_length:
-            messagebox.showerror("Error", "Padding failed!")
-            return
+                new_content[end_pos + diff:] = new_content[end_pos:new_length]
+            new_content[end_pos:end_pos + diff] = b' ' * diff
         
         if not messagebox.askyesno("Confirm", 
             f"Inject into {name} (slot {idx})?\n\n"
@@ -960,12 +1507,11 @@ Content Length: {info['content_length']:,} bytes""")
             f"This modifies the main .dat file.\nBackup recommended!"):
             return
         
-        # Perform surgery
-        with open(self.dat_path, 'r+b') as f:
-            f.seek(info['content_start'])
-            f.write(new_content)
+        # Perform surgery in place through the writable mapping
+        self.patch_dat(info['content_start'], new_content)
+        self.invalidate_scan_cache()
         
-        new_size = os.path.getsize(self.dat_path)
+        new_size = os.stat(self.dat_path).st_size
         self.log(f"✓ Injected {name}! File size: {new_size:,} bytes")
         
         if new_size == EXPECTED_FILE_SIZE:
@@ -986,60 +1532,75 @@ Content Length: {info['content_length']:,} bytes""")
         self.build_smidata_ui(self.current_smidata_block)
         
         block = self.current_smidata_block
-        self.smidata_info.config(text=f"Size: {len(block['text'])} chars | Offset: 0x{block['start']:X}")
+        self.smidata_info.config(text=f"Size: {block['end'] - block['start']} bytes | Offset: 0x{block['start']:X}")
     
     def build_smidata_ui(self, block):
-        for w in self.param_scroll_frame.winfo_children():
-            w.destroy()
-        
-        self.smidata_entries.clear()
         params = block["params"]
         
-        categories = {
-            "Basic Info": ["c8Code", "s8Index", "u8Enabled", "s8PlayerNum"],
-            "Scoring": ["s32Rating_0", "s32Rating_1", "s32Rating_2", "s32BonusPoint", "s16BonusCategoryRate"],
-            "Time & Goals": ["f32Time", "s32ShootingStarTime", "u32Target", "f32DispScaleCoef"],
-            "Game Mode": ["u8Proc", "u8Eternal", "u8Modoki", "u8BonusCategory", "u8TgtMonoIdx"],
-            "Display": ["s82dScale", "s82dCore", "s82dOujiBase", "u8UseCore", "u8ViewCore", "u8Scale2d"],
-            "Environment": ["u8Fog", "u8Light", "u8Acc", "u8Camera", "s8Crumble"],
-            "Messages": ["u8GameMessage", "u8LectureMessage", "u8ResultMessage"],
-            "Maps & Scripts": ["u8MapScript_0", "u8MapScript_1", "u8MapScript_2", 
-                              "u8LocScript_0", "u8LocScript_1", "u8LocScript_2"],
-            "Other": ["u8Override", "u8Star", "u8NetworkRanking", "u8ClearOnlySpace",
-                     "s8Present", "s8ChainEff", "s8SnowFlowerEff", "s16TgtMono",
-                     "s16CoreInitID", "u8AriaNum", "s16MonoMdl", "s8Warp", "s8AreaChange"]
-        }
+        # Level blocks almost always share one layout; when it matches the
+        # rows on screen, refill them in place instead of rebuilding ~45 rows
+        layout = tuple((k, len(v) > 30) for k, v in params.items())
+        if layout == self._smidata_layout:
+            self.refill_smidata_ui(params)
+            return
+        self._smidata_layout = layout
         
-        shown = set()
+        self.param_scroll_frame = self.new_scroll_frame(self.param_canvas, self.param_scroll_frame)
         
-        for cat_name, cat_keys in categories.items():
-            has_params = any(k in params for k in cat_keys)
-            if not has_params:
-                continue
-            
+        self.smidata_entries.clear()
+        
+        for cat_name, cat_keys in self.smidata_sections(params):
             header = tk.Label(self.param_scroll_frame, text=f"━━━ {cat_name} ━━━",
                              font=("Arial", 10, "bold"), fg="#444")
             header.pack(fill=tk.X, pady=(10, 5), padx=5)
             
             for key in cat_keys:
-                if key not in params:
-                    continue
-                shown.add(key)
-                self.create_param_row(key, params[key])
-        
-        remaining = [k for k in params if k not in shown]
-        if remaining:
-            header = tk.Label(self.param_scroll_frame, text="━━━ Other ━━━",
-                             font=("Arial", 10, "bold"), fg="#444")
-            header.pack(fill=tk.X, pady=(10, 5), padx=5)
-            for key in remaining:
                 self.create_param_row(key, params[key])
     
+    def smidata_sections(self, params):
+        """(header, present keys) pairs for a params dict, worked out once
+        per distinct key set"""
+        schema = frozenset(params)
+        sections = self._smidata_sections.get(schema)
+        if sections is None:
+            sections = []
+            for cat_name, cat_keys in PARAM_CATEGORIES.items():
+                present = [k for k in cat_keys if k in schema]
+                if present:
+                    sections.append((cat_name, present))
+            remaining = [k for k in params if k not in PARAM_CATEGORIZED]
+            if remaining:
+                sections.append(("Other", remaining))
+            self._smidata_sections[schema] = sections
+        return sections
+    
+    def refill_smidata_ui(self, params):
+        for key, info in self.smidata_entries.items():
+            value = params[key]
+            entry = info["widget"]
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+            info["orig"] = value
+            info["dirty"] = False
+            
+            if "label" in info:
+                try:
+                    current_int = int(value)
+                except ValueError:
+                    current_int = 0
+                info["label"].config(text=f"→ {option_label(info['options'], current_int)}")
+            elif len(value) <= 30:
+                entry.config(width=max(12, len(value) + 4))
+    
     def create_param_row(self, key, value):
         frame = tk.Frame(self.param_scroll_frame, relief="groove", borderwidth=1)
         frame.pack(fill=tk.X, padx=5, pady=2)
         
-        param_info = SMIDATA_PARAMS.get(key, {"desc": "", "type": "str"})
+        idx = PARAM_INDEX.get(key)
+        if idx is None:
+            options, desc = None, ""
+        else:
+            options, desc = PARAM_OPTION_TABLES[idx], PARAM_DESC[idx]
         
         key_label = tk.Label(frame, text=key, width=18, anchor="w", font=("Consolas", 9, "bold"))
         key_label.pack(side=tk.LEFT, padx=5)
@@ -1047,74 +1608,80 @@ Content Length: {info['content_length']:,} bytes""")
         content = tk.Frame(frame)
         content.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        if "options" in param_info:
+        if options is not None:
             row = tk.Frame(content)
             row.pack(anchor="w", fill=tk.X)
             
-            entry = tk.Entry(row, width=8, font=("Consolas", 9))
+            entry = tk.Entry(row, width=8, font=self.font_entry)
             entry.insert(0, value)
             entry.pack(side=tk.LEFT, padx=2)
             
-            options = param_info["options"]
             try:
                 current_int = int(value)
             except:
                 current_int = 0
-            option_text = options.get(current_int, "(unknown)")
+            option_text = option_label(options, current_int)
             
             opt_label = tk.Label(row, text=f"→ {option_text}", fg="blue", font=("Arial", 8))
             opt_label.pack(side=tk.LEFT, padx=5)
             
-            def update_option(event, e=entry, lbl=opt_label, opts=options):
+            def update_option(e=entry, lbl=opt_label, opts=options):
+                if not lbl.winfo_exists():
+                    return
                 try:
                     v = int(e.get())
-                    lbl.config(text=f"→ {opts.get(v, '(unknown)')}")
+                    lbl.config(text=f"→ {option_label(opts, v)}")
                 except:
                     lbl.config(text="→ (invalid)")
             
-            entry.bind("<KeyRelease>", update_option)
-            self.smidata_entries[key] = {"widget": entry, "orig": value}
+            # Relabel once typing pauses, not on every keystroke
+            entry.bind("<KeyRelease>", lambda event, k=key: self.debounce(("option", k), 80, update_option))
+            self.smidata_entries[key] = {"widget": entry, "orig": value, "label": opt_label, "options": options}
         
         elif len(value) > 30:
-            entry = tk.Entry(content, width=60, font=("Consolas", 8))
+            entry = tk.Entry(content, width=60, font=self.font_entry_small)
             entry.insert(0, value)
             entry.pack(anchor="w", padx=2)
             self.smidata_entries[key] = {"widget": entry, "orig": value}
         
         else:
-            entry = tk.Entry(content, width=max(12, len(value) + 4), font=("Consolas", 9))
+            entry = tk.Entry(content, width=max(12, len(value) + 4), font=self.font_entry)
             entry.insert(0, value)
             entry.pack(side=tk.LEFT, padx=2)
             self.smidata_entries[key] = {"widget": entry, "orig": value}
         
-        if param_info.get("desc"):
-            desc = param_info["desc"]
+        # Only fields the user touched are written back
+        info = self.smidata_entries[key]
+        info["dirty"] = False
+        for seq in EDIT_EVENTS:
+            entry.bind(seq, lambda event, info=info: info.update(dirty=True), add="+")
+        
+        if desc:
             if len(desc) > 45:
                 desc = desc[:42] + "..."
             desc_label = tk.Label(frame, text=f"? {desc}", fg="gray", font=("Arial", 7))
             desc_label.pack(side=tk.RIGHT, padx=5)
     
     def build_smidata_text(self, block):
-        new_text = block["text"]
+        return self.build_smidata_bytes(block).decode('utf-8', errors='ignore')
+    
+    def build_smidata_bytes(self, block):
+        """Block bytes with the edited fields spliced in, as a bytearray"""
+        raw = self.block_bytes(block)
+        spans = block.get("spans") if _spans_hold(block, raw) else None
+        changes = []
         
         for key, entry_info in self.smidata_entries.items():
-            new_val = entry_info["widget"].get()
-            orig_val = entry_info["orig"]
-            
-            if len(new_val) != len(orig_val):
-                if len(new_val) < len(orig_val):
-                    new_val = new_val + ' ' * (len(orig_val) - len(new_val))
-                else:
-                    new_val = new_val[:len(orig_val)]
-            
-            new_text = re.sub(
-                f'({key}\\s*=\\s*").*?(")',
-                lambda m, nv=new_val: m.group(1) + nv + m.group(2),
-                new_text,
-                count=1
-            )
-        
-        return new_text
+            if not entry_info["dirty"]:
+                continue
+            changes.append((key, _fit(entry_info["widget"].get(), len(entry_info["orig"]))))
+        
+        if spans is None:
+            new_text = raw.decode('utf-8', errors='ignore')
+            for key, new_val in changes:
+                new_text = _sub_value(new_text, key, new_val)
+            return bytearray(new_text.encode('utf-8'))
+        return _splice_values(raw, [(*spans[key], new_val) for key, new_val in changes if key in spans])
     
     def export_smidata_block(self):
         if not self.current_smidata_block:
@@ -1122,7 +1689,7 @@ Content Length: {info['content_length']:,} bytes""")
             return
         
         block = self.current_smidata_block
-        new_text = self.build_smidata_text(block)
+        new_bytes = self.build_smidata_bytes(block)
         
         path = filedialog.asksaveasfilename(
             defaultextension=".txt",
@@ -1130,43 +1697,41 @@ Content Length: {info['content_length']:,} bytes""")
         )
         
         if path:
-            with open(path, "w") as f:
-                f.write(new_text)
+            with open(path, "wb") as f:
+                f.write(new_bytes)
             self.log(f"Exported params: {block['code']} -> {path}")
             messagebox.showinfo("Exported", f"Saved to:\n{path}")
     
+    def smidata_patch(self, block):
+        """Bytes to write over block, padded to its length. Raises
+        ValueError if the edits no longer fit."""
+        new_bytes = self.build_smidata_bytes(block)
+        diff = (block['end'] - block['start']) - len(new_bytes)
+        if diff < 0:
+            raise ValueError(f"New content is {-diff} bytes too long!")
+        if diff:
+            # Pad inside the tag, ahead of the closing "/>"
+            new_bytes[-2:-2] = b' ' * diff
+        return new_bytes
+    
     def inject_smidata_block(self):
         if not self.current_smidata_block or not self.dat_path:
             messagebox.showwarning("Warning", "Load DAT and select a level first")
             return
         
         block = self.current_smidata_block
-        new_text = self.build_smidata_text(block)
-        new_bytes = new_text.encode('utf-8')
-        
-        orig_len = block['end'] - block['start']
-        
-        if len(new_bytes) != orig_len:
-            diff = orig_len - len(new_bytes)
-            if diff > 0:
-                new_text = new_text[:-2] + (' ' * diff) + new_text[-2:]
-                new_bytes = new_text.encode('utf-8')
-            else:
-                messagebox.showerror("Error", f"New content is {-diff} bytes too long!")
-                return
-        
-        if len(new_bytes) != orig_len:
-            messagebox.showerror("Error", f"Length mismatch: {len(new_bytes)} vs {orig_len}")
+        try:
+            new_bytes = self.smidata_patch(block)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
         
         if not messagebox.askyesno("Confirm", f"Inject params for '{block['code']}'?"):
             return
         
-        with open(self.dat_path, 'r+b') as f:
-            f.seek(block['start'])
-            f.write(new_bytes)
+        self.patch_dat(block['start'], new_bytes)
         
-        block["text"] = new_text
+        self.invalidate_scan_cache()
         self.log(f"✓ Injected params: {block['code']} at 0x{block['start']:X}")
         messagebox.showinfo("Success", "Parameters injected!")
     
@@ -1181,11 +1746,18 @@ Content Length: {info['content_length']:,} bytes""")
             self.build_lighting_ui(self.current_lighting_block["params"])
     
     def build_lighting_ui(self, params):
-        for w in self.light_scroll_frame.winfo_children():
-            w.destroy()
+        # Same row layout as the stage on screen: refill instead of rebuild
+        layout = tuple((item["key"], len(item["parts"]), item["is_color"], item["is_dir"]) for item in params)
+        if layout == self._lighting_layout:
+            self.refill_lighting_ui(params)
+            return
+        self._lighting_layout = layout
+        
+        self.light_scroll_frame = self.new_scroll_frame(self.light_canvas, self.light_scroll_frame)
         
         self.lighting_entries.clear()
         self.color_buttons.clear()
+        self._button_colors.clear()
         self.dir_canvases.clear()
         self.dir_sliders.clear()
         
@@ -1212,19 +1784,21 @@ Content Length: {info['content_length']:,} bytes""")
                 e = tk.Entry(row, width=9)
                 e.insert(0, p)
                 e.pack(side=tk.LEFT, padx=2)
-                ents.append({"widget": e, "orig": p})
-                try:
-                    vals.append(float(p))
-                except:
-                    vals.append(0.0)
+                # "val" shadows the entry as a float (None: reparse the text),
+                # "dirty" marks fields changed since the block was loaded
+                ent = {"widget": e, "orig": p, "val": _float_or_none(p), "dirty": False}
+                for seq in EDIT_EVENTS:
+                    e.bind(seq, lambda event, ent=ent: ent.update(val=None, dirty=True), add="+")
+                ents.append(ent)
+                vals.append(ent["val"] or 0.0)
             
             self.lighting_entries[key] = ents
             
             if item["is_color"] and len(vals) >= 3:
                 btn = tk.Button(row, text="Pick", width=5, command=lambda k=key: self.pick_color(k))
-                btn.config(bg=self.rgb_to_hex(vals[0], vals[1], vals[2]))
                 btn.pack(side=tk.LEFT, padx=5)
                 self.color_buttons[key] = btn
+                self.set_button_color(key, self.rgb_to_hex(vals[0], vals[1], vals[2]))
             
             if item["is_dir"] and len(vals) >= 3:
                 ctrl = tk.Frame(content)
@@ -1252,24 +1826,70 @@ Content Length: {info['content_length']:,} bytes""")
                 
                 self.dir_sliders[key] = sliders
     
+    def refill_lighting_ui(self, params):
+        for item in params:
+            key = item["key"]
+            if key == "Stage":
+                continue
+            
+            vals = []
+            for e, p in zip(self.lighting_entries[key], item["parts"]):
+                e["widget"].delete(0, tk.END)
+                e["widget"].insert(0, p)
+                e["orig"] = p
+                e["val"] = _float_or_none(p)
+                e["dirty"] = False
+                vals.append(e["val"] or 0.0)
+            
+            if key in self.color_buttons:
+                self.set_button_color(key, self.rgb_to_hex(vals[0], vals[1], vals[2]))
+            
+            if key in self.dir_canvases:
+                self.draw_arrow(self.dir_canvases[key], vals[0], vals[1])
+                for s, v in zip(self.dir_sliders[key], vals):
+                    s.set(v)
+    
     def pick_color(self, key):
         c = colorchooser.askcolor()
         if not c[0]:
             return
-        rgb = [v / 255 for v in c[0]]
-        for i, e in enumerate(self.lighting_entries[key]):
-            if i < 3:
-                e["widget"].delete(0, tk.END)
-                e["widget"].insert(0, f"{rgb[i]:.3f}")
-        self.color_buttons[key].config(bg=c[1])
+        # Shadow values update now; the widgets in one idle pass after the
+        # dialog has closed
+        updates = []
+        for e, v in zip(self.lighting_entries[key][:3], c[0]):
+            text = f"{v / 255:.3f}"
+            e["val"] = float(text)
+            e["dirty"] = True
+            updates.append((e["widget"], text))
+        self.root.after_idle(self.apply_color_pick, key, c[1], updates)
+    
+    def apply_color_pick(self, key, color, updates):
+        for widget, text in updates:
+            if widget.winfo_exists():
+                widget.delete(0, tk.END)
+                widget.insert(0, text)
+        if key in self.color_buttons:
+            self.set_button_color(key, color)
     
     def move_dir(self, val, idx, key):
         ent = self.lighting_entries[key][idx]
+        text = f"{float(val):.3f}"
         ent["widget"].delete(0, tk.END)
-        ent["widget"].insert(0, f"{float(val):.3f}")
-        x = float(self.lighting_entries[key][0]["widget"].get())
-        y = float(self.lighting_entries[key][1]["widget"].get())
-        self.draw_arrow(self.dir_canvases[key], x, y)
+        ent["widget"].insert(0, text)
+        ent["val"] = float(text)
+        ent["dirty"] = True
+        # Dragging fires continuously; redraw the arrow once it settles
+        self.debounce(("arrow", key), 80, self.redraw_dir, key)
+    
+    def redraw_dir(self, key):
+        canvas = self.dir_canvases.get(key)
+        if canvas is None or not canvas.winfo_exists():
+            return
+        x, y = (e["val"] if e["val"] is not None else _float_or_none(e["widget"].get())
+                for e in self.lighting_entries[key][:2])
+        if x is None or y is None:
+            return
+        self.draw_arrow(canvas, x, y)
     
     def draw_arrow(self, canvas, x, y):
         canvas.delete("all")
@@ -1281,62 +1901,93 @@ Content Length: {info['content_length']:,} bytes""")
         canvas.create_line(cx, cy, cx+x, cy-y, arrow=tk.LAST, width=2)
     
     def rgb_to_hex(self, r, g, b):
-        return f"#{int(max(0,min(1,r))*255):02x}{int(max(0,min(1,g))*255):02x}{int(max(0,min(1,b))*255):02x}"
+        hex_byte = _HEX_BYTE
+        return ("#" + hex_byte[int(r * 255) if 0 <= r <= 1 else (0 if r < 0 else 255)]
+                + hex_byte[int(g * 255) if 0 <= g <= 1 else (0 if g < 0 else 255)]
+                + hex_byte[int(b * 255) if 0 <= b <= 1 else (0 if b < 0 else 255)])
+    
+    def set_button_color(self, key, color):
+        # Skip the reconfigure (and button redraw) when the color is unchanged
+        if self._button_colors.get(key) != color:
+            self._button_colors[key] = color
+            self.color_buttons[key].config(bg=color)
     
     def enforce_length(self, orig, val):
-        s = f"{val:.6f}"
-        if len(s) < len(orig):
-            s += "0" * (len(orig) - len(s))
-        return s[:len(orig)]
+        # Format straight to the precision that fills the original width
+        width = len(orig)
+        whole = int(val)
+        prec = width - len(str(whole)) - 1
+        if val < 0 and not whole:
+            prec -= 1  # "-0.xxx": the sign is not part of str(0)
+        if prec >= 1:
+            s = f"{val:.{prec}f}"
+        else:
+            # No room for decimals: cut to the integer (or "12."), rounding
+            # could carry into a digit the slot cannot hold
+            s = f"{val:.6f}"
+        if len(s) < width:
+            s += ("0" if "." in s else " ") * (width - len(s))
+        return s[:width]
     
     def export_lighting_block(self):
         if not self.current_lighting_block:
             return
         block = self.current_lighting_block
-        new_text = self.build_lighting_text(block)
+        new_bytes = self.build_lighting_text(block).encode('utf-8')
         path = filedialog.asksaveasfilename(defaultextension=".txt", initialfile=f"{block['stage']}.txt")
         if path:
-            with open(path, "w") as f:
-                f.write(new_text)
+            with open(path, "wb") as f:
+                f.write(new_bytes)
             self.log(f"Exported lighting: {block['stage']} -> {path}")
     
     def build_lighting_text(self, block):
-        new_text = block["text"]
+        raw = self.block_bytes(block)
+        new_text = raw.decode('utf-8', errors='ignore')
+        use_spans = _spans_hold(block, raw) and all("span" in p for p in block["params"])
+        edits = []
         for p in block["params"]:
             key = p["key"]
             if key == "Stage":
                 continue
             parts = []
             for e in self.lighting_entries[key]:
-                try:
-                    val = float(e["widget"].get())
-                    parts.append(self.enforce_length(e["orig"], val))
-                except:
-                    parts.append(e["orig"])
+                val = e["val"] if e["dirty"] else None
+                if val is None and e["dirty"]:
+                    val = _float_or_none(e["widget"].get())
+                parts.append(e["orig"] if val is None else self.enforce_length(e["orig"], val))
             new_val = " ".join(parts)
-            new_text = re.sub(f'({key}\\s*=\\s*").*?(")', lambda m: m.group(1) + new_val + m.group(2), new_text, count=1)
+            if use_spans:
+                edits.append((*p["span"], new_val))
+            else:
+                new_text = _sub_value(new_text, key, new_val)
+        if use_spans:
+            new_text = _splice_values(raw, edits).decode('utf-8', errors='ignore')
         return new_text
     
+    def lighting_patch(self, block):
+        """Bytes to write over block. Raises ValueError on a length change."""
+        new_bytes = self.build_lighting_text(block).encode('utf-8')
+        orig_len = block['end'] - block['start']
+        if len(new_bytes) != orig_len:
+            raise ValueError(f"Length mismatch: {len(new_bytes)} vs {orig_len}")
+        return new_bytes
+    
     def inject_lighting_block(self):
         if not self.current_lighting_block:
             return
         block = self.current_lighting_block
-        new_text = self.build_lighting_text(block)
-        new_bytes = new_text.encode('utf-8')
-        orig_len = block['end'] - block['start']
-        
-        if len(new_bytes) != orig_len:
-            messagebox.showerror("Error", f"Length mismatch: {len(new_bytes)} vs {orig_len}")
+        try:
+            new_bytes = self.lighting_patch(block)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
         
         if not messagebox.askyesno("Confirm", f"Inject lighting for '{block['stage']}'?"):
             return
         
-        with open(self.dat_path, 'r+b') as f:
-            f.seek(block['start'])
-            f.write(new_bytes)
+        self.patch_dat(block['start'], new_bytes)
         
-        block["text"] = new_text
+        self.invalidate_scan_cache()
         self.log(f"✓ Injected lighting: {block['stage']} at 0x{block['start']:X}")
         messagebox.showinfo("Success", "Lighting injected!")
     
@@ -1353,13 +2004,13 @@ Content Length: {info['content_length']:,} bytes""")
         self.build_warp_ui(self.current_warp_block)
         
         block = self.current_warp_block
-        self.warp_info.config(text=f"Size: {len(block['text']):,} chars | Offset: 0x{block['start']:X}")
+        self.warp_info.config(text=f"Size: {block['end'] - block['start']:,} bytes | Offset: 0x{block['start']:X}")
     
     def build_warp_ui(self, block):
-        for w in self.warp_scroll_frame.winfo_children():
-            w.destroy()
+        self.warp_scroll_frame = self.new_scroll_frame(self.warp_canvas, self.warp_scroll_frame)
         
         self.warp_entries.clear()
+        self.warp_vectors.clear()
         
         # Header with block name and type
         block_type = block.get("block_type", "unknown")
@@ -1389,7 +2040,7 @@ Content Length: {info['content_length']:,} bytes""")
                 if entry_type == "area_change":
                     self._build_area_change_entry(i, params)
                 elif entry_type == "warp":
-                    self._build_warp_entry(i, params)
+                    self._build_warp_entry(i, params, entry["parts"])
         else:
             # Fallback to raw text
             header = tk.Label(self.warp_scroll_frame, 
@@ -1402,145 +2053,90 @@ Content Length: {info['content_length']:,} bytes""")
             
             raw_text = scrolledtext.ScrolledText(text_frame, font=("Consolas", 8), 
                                                   width=100, height=30, wrap=tk.NONE)
-            raw_text.insert(tk.END, block["text"])
+            block_text = self.block_text(block)
+            raw_text.insert(tk.END, block_text)
+            raw_text.edit_modified(False)
             raw_text.pack(fill=tk.BOTH, expand=True)
             
-            self.warp_entries["_raw_text"] = {"widget": raw_text, "orig": block["text"]}
+            raw_entry = {"widget": raw_text, "edited": False}
+            self.warp_entries["_raw_text"] = raw_entry
+            
+            def mark_edited(event):
+                raw_entry["edited"] = True
+                raw_text.edit_modified(False)
+            raw_text.bind("<<Modified>>", mark_edited)
     
     def _build_area_change_entry(self, i, params):
         """Build UI for SGiAreaChangeData entry"""
+        bg = "#f0f8ff"
         entry_frame = tk.LabelFrame(self.warp_scroll_frame, 
                                    text=f"Area Change #{i} (CoreSize: {params.get('s32CoreSize', '?')}mm)",
-                                   padx=10, pady=5, bg="#f0f8ff")
+                                   padx=10, pady=5, bg=bg)
         entry_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Size parameters row
-        size_frame = tk.Frame(entry_frame, bg="#f0f8ff")
-        size_frame.pack(fill=tk.X, pady=2)
-        tk.Label(size_frame, text="Sizes:", font=("Arial", 8, "bold"), width=8, anchor="w", bg="#f0f8ff").pack(side=tk.LEFT)
-        
-        size_params = ["s32CoreSize", "s32DeleteStartSize0", "s32DeleteStartSize", "s32DeleteMonoSize"]
-        for key in size_params:
-            if key in params:
-                short_name = key.replace("s32", "").replace("Delete", "Del").replace("Start", "St")
-                tk.Label(size_frame, text=f"{short_name}:", font=("Arial", 7), fg="gray", bg="#f0f8ff").pack(side=tk.LEFT)
-                e = tk.Entry(size_frame, width=10, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "area_change"}
-        
-        # ID parameters row
-        id_frame = tk.Frame(entry_frame, bg="#f0f8ff")
-        id_frame.pack(fill=tk.X, pady=2)
-        tk.Label(id_frame, text="IDs:", font=("Arial", 8, "bold"), width=8, anchor="w", bg="#f0f8ff").pack(side=tk.LEFT)
-        
-        for key in ["s8CoreID", "s16Mdl"]:
-            if key in params:
-                tk.Label(id_frame, text=f"{key.replace('s8','').replace('s16','')}:", font=("Arial", 7), fg="gray", bg="#f0f8ff").pack(side=tk.LEFT)
-                e = tk.Entry(id_frame, width=6, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "area_change"}
-        
-        # Map parameters row
-        map_frame = tk.Frame(entry_frame, bg="#f0f8ff")
-        map_frame.pack(fill=tk.X, pady=2)
-        tk.Label(map_frame, text="Maps:", font=("Arial", 8, "bold"), width=8, anchor="w", bg="#f0f8ff").pack(side=tk.LEFT)
-        
-        for key in ["s16DeleteMap", "s16Map", "s16Loc"]:
-            if key in params:
-                tk.Label(map_frame, text=f"{key.replace('s16','')}:", font=("Arial", 7), fg="gray", bg="#f0f8ff").pack(side=tk.LEFT)
-                e = tk.Entry(map_frame, width=8, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "area_change"}
-        
-        # Other parameters row
-        other_frame = tk.Frame(entry_frame, bg="#f0f8ff")
-        other_frame.pack(fill=tk.X, pady=2)
-        tk.Label(other_frame, text="Other:", font=("Arial", 8, "bold"), width=8, anchor="w", bg="#f0f8ff").pack(side=tk.LEFT)
-        
-        for key in ["s8WarpID", "s8ChangeType", "s8FogID"]:
-            if key in params:
-                tk.Label(other_frame, text=f"{key.replace('s8','')}:", font=("Arial", 7), fg="gray", bg="#f0f8ff").pack(side=tk.LEFT)
-                e = tk.Entry(other_frame, width=8, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "area_change"}
+        def fields(keys, width, short):
+            return [(f"{short(k)}:", params[k], width, k, {}) for k in keys if k in params]
+        
+        rows = [
+            ("Sizes:", fields(["s32CoreSize", "s32DeleteStartSize0", "s32DeleteStartSize", "s32DeleteMonoSize"], 10,
+                              lambda k: k.replace("s32", "").replace("Delete", "Del").replace("Start", "St"))),
+            ("IDs:", fields(["s8CoreID", "s16Mdl"], 6, lambda k: k.replace('s8', '').replace('s16', ''))),
+            ("Maps:", fields(["s16DeleteMap", "s16Map", "s16Loc"], 8, lambda k: k.replace('s16', ''))),
+            ("Other:", fields(["s8WarpID", "s8ChangeType", "s8FogID"], 8, lambda k: k.replace('s8', ''))),
+        ]
+        self._grid_warp_fields(entry_frame, bg, 8, i, "area_change", rows)
     
-    def _build_warp_entry(self, i, params):
+    def _build_warp_entry(self, i, params, parts):
         """Build UI for SGiMiWarp entry"""
+        bg = "#fff0f5"
         entry_frame = tk.LabelFrame(self.warp_scroll_frame, 
                                    text=f"Warp Point #{i}",
-                                   padx=10, pady=5, bg="#fff0f5")
+                                   padx=10, pady=5, bg=bg)
         entry_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Position row (fvPosi)
-        if "fvPosi" in params:
-            pos_frame = tk.Frame(entry_frame, bg="#fff0f5")
-            pos_frame.pack(fill=tk.X, pady=2)
-            tk.Label(pos_frame, text="Position:", font=("Arial", 8, "bold"), width=10, anchor="w", bg="#fff0f5").pack(side=tk.LEFT)
-            
-            pos_parts = params["fvPosi"].split()
-            for j, (label, val) in enumerate(zip(["X:", "Y:", "Z:"], pos_parts)):
-                tk.Label(pos_frame, text=label, font=("Arial", 7), fg="gray", bg="#fff0f5").pack(side=tk.LEFT)
-                e = tk.Entry(pos_frame, width=10, font=("Consolas", 9))
-                e.insert(0, val)
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_fvPosi_{j}"] = {"widget": e, "orig": val, "entry_idx": i, "type": "warp", "is_position": True, "pos_idx": j}
-        
-        # Direction row
-        dir_frame = tk.Frame(entry_frame, bg="#fff0f5")
-        dir_frame.pack(fill=tk.X, pady=2)
-        tk.Label(dir_frame, text="Direction:", font=("Arial", 8, "bold"), width=10, anchor="w", bg="#fff0f5").pack(side=tk.LEFT)
-        
-        for key in ["s16InDir", "s16OutDir"]:
-            if key in params:
-                tk.Label(dir_frame, text=f"{key.replace('s16','')}:", font=("Arial", 7), fg="gray", bg="#fff0f5").pack(side=tk.LEFT)
-                e = tk.Entry(dir_frame, width=6, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "warp"}
-        
-        # Stage row
-        stage_frame = tk.Frame(entry_frame, bg="#fff0f5")
-        stage_frame.pack(fill=tk.X, pady=2)
-        tk.Label(stage_frame, text="Stage:", font=("Arial", 8, "bold"), width=10, anchor="w", bg="#fff0f5").pack(side=tk.LEFT)
-        
-        for key in ["s16OutStage", "s8OutStageFlag"]:
-            if key in params:
-                tk.Label(stage_frame, text=f"{key.replace('s16','').replace('s8','')}:", font=("Arial", 7), fg="gray", bg="#fff0f5").pack(side=tk.LEFT)
-                e = tk.Entry(stage_frame, width=8, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "warp"}
+        def fields(keys, width):
+            return [(f"{k.replace('s32', '').replace('s16', '').replace('s8', '')}:", params[k], width, k, {})
+                    for k in keys if k in params]
         
-        # Fade color row (f32FadeColor)
+        rows = []
+        if "fvPosi" in params:
+            rows.append(("Position:", [
+                (label, val, 10, f"fvPosi_{j}", {"is_position": True, "pos_idx": j})
+                for j, (label, val) in enumerate(zip(["X:", "Y:", "Z:"], parts["fvPosi"]))
+            ]))
+        rows.append(("Direction:", fields(["s16InDir", "s16OutDir"], 6)))
+        rows.append(("Stage:", fields(["s16OutStage", "s8OutStageFlag"], 8)))
         if "f32FadeColor" in params:
-            fade_frame = tk.Frame(entry_frame, bg="#fff0f5")
-            fade_frame.pack(fill=tk.X, pady=2)
-            tk.Label(fade_frame, text="Fade RGBA:", font=("Arial", 8, "bold"), width=10, anchor="w", bg="#fff0f5").pack(side=tk.LEFT)
-            
-            fade_parts = params["f32FadeColor"].split()
-            for j, (label, val) in enumerate(zip(["R:", "G:", "B:", "A:"], fade_parts)):
-                tk.Label(fade_frame, text=label, font=("Arial", 7), fg="gray", bg="#fff0f5").pack(side=tk.LEFT)
-                e = tk.Entry(fade_frame, width=6, font=("Consolas", 9))
-                e.insert(0, val)
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_f32FadeColor_{j}"] = {"widget": e, "orig": val, "entry_idx": i, "type": "warp", "is_fade": True, "fade_idx": j}
-        
-        # Other params row
-        other_frame = tk.Frame(entry_frame, bg="#fff0f5")
-        other_frame.pack(fill=tk.X, pady=2)
-        tk.Label(other_frame, text="Other:", font=("Arial", 8, "bold"), width=10, anchor="w", bg="#fff0f5").pack(side=tk.LEFT)
-        
-        for key in ["s32CoreSize", "s8SyncAreaChange"]:
-            if key in params:
-                tk.Label(other_frame, text=f"{key.replace('s32','').replace('s8','')}:", font=("Arial", 7), fg="gray", bg="#fff0f5").pack(side=tk.LEFT)
-                e = tk.Entry(other_frame, width=8, font=("Consolas", 9))
-                e.insert(0, params[key])
-                e.pack(side=tk.LEFT, padx=2)
-                self.warp_entries[f"{i}_{key}"] = {"widget": e, "orig": params[key], "entry_idx": i, "type": "warp"}
+            rows.append(("Fade RGBA:", [
+                (label, val, 6, f"f32FadeColor_{j}", {"is_fade": True, "fade_idx": j})
+                for j, (label, val) in enumerate(zip(["R:", "G:", "B:", "A:"], parts["f32FadeColor"]))
+            ]))
+        rows.append(("Other:", fields(["s32CoreSize", "s8SyncAreaChange"], 8)))
+        self._grid_warp_fields(entry_frame, bg, 10, i, "warp", rows)
+        
+        # Component widgets of each complete vector, written back as one value
+        for key, count in (("fvPosi", 3), ("f32FadeColor", 4)):
+            names = [f"{i}_{key}_{j}" for j in range(count)]
+            if all(name in self.warp_entries for name in names):
+                self.warp_vectors[(i, key)] = [(name, self.warp_entries[name]) for name in names]
+    
+    def _grid_warp_fields(self, frame, bg, head_width, i, entry_type, rows):
+        """Lay out one entry as a single grid: a heading column followed by
+        label/entry pairs. rows holds (heading, fields), each field being
+        (label, value, entry width, name, extra warp_entries info)."""
+        for r, (heading, row_fields) in enumerate(rows):
+            tk.Label(frame, text=heading, font=("Arial", 8, "bold"), width=head_width,
+                     anchor="w", bg=bg).grid(row=r, column=0, sticky="w", pady=2)
+            for c, (label, value, width, name, extra) in enumerate(row_fields):
+                tk.Label(frame, text=label, font=("Arial", 7), fg="gray", bg=bg).grid(row=r, column=2 * c + 1, sticky="e")
+                e = tk.Entry(frame, width=width, font=self.font_entry)
+                e.insert(0, value)
+                e.grid(row=r, column=2 * c + 2, sticky="w", padx=2, pady=2)
+                info = {"widget": e, "orig": value, "entry_idx": i, "type": entry_type, "dirty": False, **extra}
+                self.warp_entries[f"{i}_{name}"] = info
+                # Only fields the user touched are written back
+                for seq in EDIT_EVENTS:
+                    e.bind(seq, lambda event, info=info: info.update(dirty=True), add="+")
     
     def _is_float(self, s):
         try:
@@ -1550,83 +2146,59 @@ Content Length: {info['content_length']:,} bytes""")
             return False
     
     def build_warp_text(self, block):
-        """Build modified warp/area change block text with current UI values"""
-        if "_raw_text" in self.warp_entries:
-            return self.warp_entries["_raw_text"]["widget"].get("1.0", tk.END).rstrip('\n')
-        
-        new_text = block["text"]
+        return self.build_warp_bytes(block).decode('utf-8', errors='ignore')
+    
+    def build_warp_bytes(self, block):
+        """Warp/area change block bytes with current UI values, as a bytearray"""
+        raw_entry = self.warp_entries.get("_raw_text")
+        if raw_entry:
+            # Only copy the widget contents back out once the user has typed
+            if not raw_entry["edited"]:
+                return bytearray(self.block_bytes(block))
+            return bytearray(raw_entry["widget"].get("1.0", tk.END).rstrip('\n').encode('utf-8'))
+        
+        raw = self.block_bytes(block)
+        buf = bytearray(raw)
+        for offset, data in self.warp_edits(block, raw):
+            buf[offset:offset + len(data)] = data
+        return buf
+    
+    def warp_edits(self, block, raw=None):
+        """(offset into block, bytes) for every edited field, each exactly as
+        wide as the scanned value it replaces. Raises ValueError when the DAT
+        no longer covers the scanned block (raw: its bytes, read if not given)."""
+        widgets = self.warp_entries
+        # One Tcl round-trip per edited field; clean fields still hold orig
+        values = {name: e["widget"].get() for name, e in widgets.items() if e.get("dirty")}
         entries = block.get("entries", [])
+        edits = []
         
-        for i, entry in enumerate(entries):
-            old_entry_text = entry["text"]
-            new_entry_text = old_entry_text
+        # Entries without an edited field are left as scanned
+        for i in sorted({widgets[name]["entry_idx"] for name in values}):
+            spans = entries[i]["spans"]
+            prefix = f"{i}_"
             
-            # Handle position components (fvPosi)
-            if f"{i}_fvPosi_0" in self.warp_entries:
-                pos_parts = []
-                for j in range(3):
-                    key = f"{i}_fvPosi_{j}"
-                    if key in self.warp_entries:
-                        pos_parts.append(self.warp_entries[key]["widget"].get())
-                if len(pos_parts) == 3:
-                    orig_posi = entry["params"].get("fvPosi", "")
-                    new_posi = " ".join(pos_parts)
-                    # Enforce length
-                    if len(new_posi) < len(orig_posi):
-                        new_posi = new_posi + ' ' * (len(orig_posi) - len(new_posi))
-                    elif len(new_posi) > len(orig_posi):
-                        new_posi = new_posi[:len(orig_posi)]
-                    new_entry_text = re.sub(
-                        r'(fvPosi\s*=\s*").*?(")',
-                        lambda m: m.group(1) + new_posi + m.group(2),
-                        new_entry_text, count=1
-                    )
-            
-            # Handle fade color components (f32FadeColor)
-            if f"{i}_f32FadeColor_0" in self.warp_entries:
-                fade_parts = []
-                for j in range(4):
-                    key = f"{i}_f32FadeColor_{j}"
-                    if key in self.warp_entries:
-                        fade_parts.append(self.warp_entries[key]["widget"].get())
-                if len(fade_parts) == 4:
-                    orig_fade = entry["params"].get("f32FadeColor", "")
-                    new_fade = " ".join(fade_parts)
-                    if len(new_fade) < len(orig_fade):
-                        new_fade = new_fade + ' ' * (len(orig_fade) - len(new_fade))
-                    elif len(new_fade) > len(orig_fade):
-                        new_fade = new_fade[:len(orig_fade)]
-                    new_entry_text = re.sub(
-                        r'(f32FadeColor\s*=\s*").*?(")',
-                        lambda m: m.group(1) + new_fade + m.group(2),
-                        new_entry_text, count=1
-                    )
+            # Position (fvPosi) and fade color (f32FadeColor) are edited one
+            # component per widget and written back as one value
+            for key in WARP_VECTOR_KEYS:
+                components = self.warp_vectors.get((i, key))
+                if components and any(name in values for name, _ in components):
+                    start, end = spans[key]
+                    text = " ".join(values.get(name, info["orig"]) for name, info in components)
+                    edits.append((start, _fixed_bytes(text, end - start)))
             
             # Handle regular parameters
-            for key, orig_val in entry["params"].items():
-                if key in ["fvPosi", "f32FadeColor"]:
+            for key, span in spans.items():
+                if key in WARP_VECTOR_KEYS:
                     continue  # Already handled above
                 
-                entry_key = f"{i}_{key}"
-                if entry_key in self.warp_entries:
-                    new_val = self.warp_entries[entry_key]["widget"].get()
-                    orig_val = self.warp_entries[entry_key]["orig"]
-                    
-                    if len(new_val) < len(orig_val):
-                        new_val = new_val + ' ' * (len(orig_val) - len(new_val))
-                    elif len(new_val) > len(orig_val):
-                        new_val = new_val[:len(orig_val)]
-                    
-                    new_entry_text = re.sub(
-                        f'({key}\\s*=\\s*").*?(")',
-                        lambda m, nv=new_val: m.group(1) + nv + m.group(2),
-                        new_entry_text, count=1
-                    )
-            
-            new_text = new_text.replace(old_entry_text, new_entry_text)
-            entry["text"] = new_entry_text
+                val = values.get(prefix + key)
+                if val is not None:
+                    edits.append((span[0], _fixed_bytes(val, span[1] - span[0])))
         
-        return new_text
+        if edits and not _spans_hold(block, self.block_bytes(block) if raw is None else raw):
+            raise ValueError("DAT no longer matches the last scan - rescan first")
+        return edits
     
     def export_warp_block(self):
         if not self.current_warp_block:
@@ -1634,7 +2206,11 @@ Content Length: {info['content_length']:,} bytes""")
             return
         
         block = self.current_warp_block
-        new_text = self.build_warp_text(block)
+        try:
+            new_bytes = self.build_warp_bytes(block)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
         
         path = filedialog.asksaveasfilename(
             defaultextension=".txt",
@@ -1642,50 +2218,109 @@ Content Length: {info['content_length']:,} bytes""")
         )
         
         if path:
-            with open(path, "w") as f:
-                f.write(new_text)
+            # Written as-is: the block already carries its own line endings
+            with open(path, "wb") as f:
+                f.write(new_bytes)
             self.log(f"Exported warp: {block['name']} -> {path}")
             messagebox.showinfo("Exported", f"Saved to:\n{path}")
     
+    def warp_patch(self, block):
+        """Bytes to write over block, space padded to its length. Raises
+        ValueError if the edits no longer fit."""
+        new_bytes = self.build_warp_bytes(block)
+        orig_len = block['end'] - block['start']
+        diff = orig_len - len(new_bytes)
+        if diff < 0:
+            raise ValueError(
+                f"New content is {-diff} bytes too long!\n"
+                f"Original: {orig_len:,} bytes\n"
+                f"New: {len(new_bytes):,} bytes")
+        if diff:
+            # Pad with spaces
+            new_bytes.extend(b' ' * diff)
+        return new_bytes
+    
     def inject_warp_block(self):
         if not self.current_warp_block or not self.dat_path:
             messagebox.showwarning("Warning", "Load DAT and select a warp block first")
             return
         
         block = self.current_warp_block
-        new_text = self.build_warp_text(block)
-        new_bytes = new_text.encode('utf-8')
-        
-        orig_len = block['end'] - block['start']
-        
-        if len(new_bytes) != orig_len:
-            diff = orig_len - len(new_bytes)
-            if diff > 0:
-                # Pad with spaces
-                new_bytes = new_bytes + (b' ' * diff)
-            else:
-                messagebox.showerror("Error", 
-                    f"New content is {-diff} bytes too long!\n"
-                    f"Original: {orig_len:,} bytes\n"
-                    f"New: {len(new_bytes):,} bytes")
+        if "_raw_text" in self.warp_entries:
+            # Free-form text: the whole block is rewritten
+            try:
+                new_bytes = self.warp_patch(block)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            patches = [(block['start'], new_bytes)]
+        else:
+            # Only the edited values are written, each at its scanned offset
+            try:
+                patches = [(block['start'] + offset, data) for offset, data in self.warp_edits(block)]
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            if not patches:
+                messagebox.showinfo("Info", "No warp fields have been edited.")
                 return
-        
-        if len(new_bytes) != orig_len:
-            messagebox.showerror("Error", f"Length mismatch: {len(new_bytes)} vs {orig_len}")
-            return
         
         if not messagebox.askyesno("Confirm", 
             f"Inject warp data for '{block['name']}'?\n\n"
-            f"This will modify {orig_len:,} bytes at offset 0x{block['start']:X}"):
+            f"This will modify {sum(len(data) for _, data in patches):,} bytes "
+            f"in {len(patches)} range(s) from offset 0x{block['start']:X}"):
             return
         
-        with open(self.dat_path, 'r+b') as f:
-            f.seek(block['start'])
-            f.write(new_bytes)
+        # Same edit mapping as the other tabs; the ranges share one flush
+        for start, data in patches:
+            self.patch_dat(start, data)
         
-        block["text"] = new_text
+        self.invalidate_scan_cache()
         self.log(f"✓ Injected warp: {block['name']} at 0x{block['start']:X}")
         messagebox.showinfo("Success", "Warp data injected!")
+    
+    # =========================================================================
+    # BATCH INJECTION
+    # =========================================================================
+    
+    def inject_all_pending(self):
+        """Inject the selected params, lighting and warp blocks in one pass,
+        skipping any whose edits leave the DAT bytes unchanged"""
+        if not self.dat_path:
+            messagebox.showwarning("Warning", "Load DAT first")
+            return
+        
+        patches = []
+        for label, block, build in (("params", self.current_smidata_block, self.smidata_patch),
+                                    ("lighting", self.current_lighting_block, self.lighting_patch),
+                                    ("warp", self.current_warp_block, self.warp_patch)):
+            if not block:
+                continue
+            try:
+                new_bytes = build(block)
+            except ValueError as e:
+                messagebox.showerror("Error", f"{label}: {e}")
+                return
+            if new_bytes != self.block_bytes(block):
+                patches.append((block['start'], label, new_bytes))
+        
+        if not patches:
+            messagebox.showinfo("Inject All", "No pending changes.")
+            return
+        
+        patches.sort(key=lambda p: p[0])
+        summary = "\n".join(f"{label}: {len(data):,} bytes at 0x{start:X}" for start, label, data in patches)
+        if not messagebox.askyesno("Confirm", f"Inject {len(patches)} block(s)?\n\n{summary}"):
+            return
+        
+        # All writes land in the one mapping; mark_dirty merges the ranges
+        # into a single debounced flush
+        for start, label, data in patches:
+            self.patch_dat(start, data)
+        
+        self.invalidate_scan_cache()
+        self.log(f"✓ Injected {len(patches)} block(s): {', '.join(label for _, label, _ in patches)}")
+        messagebox.showinfo("Success", f"{len(patches)} block(s) injected!")
 
 
 # =============================================================================
@@ -1693,6 +2328,7 @@ Content Length: {info['content_length']:,} bytes""")
 # =============================================================================
 
 def main():
+    _init_gui()
     root = tk.Tk()
     app = KatamariDatEditor(root)
     root.mainloop()
@@ -9,12 +9,20 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 from mpl_toolkits.mplot3d import Axes3D
-from mpl_toolkits.mplot3d import proj3d 
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import copy
 
 matplotlib.use("TkAgg")
 
+# Tags read from each entity block by _parse_block
+_BLOCK_TAGS = frozenset((
+    'posi', 'roll', 'index', 'pack_id', 'attack_type', 'move_type', 'escape_type', 'move_speed', 'speed',
+    'move_path_id', 'path_id', 'scale', 'plus_type', 'plus_fly_height', 'plus_roll_speed', 'plus_angle',
+    'parent_type', 'clash_type'))
+_TOKEN_RE = re.compile(r'(<entity>|</entity>|<child>|</child>)')
+# Everything but digits and the decimal point in the item CSV's size column
+_SIZE_JUNK_RE = re.compile(r'[^\d.]')
+
 class KatamariEditor:
     def __init__(self, root):
         self.root = root
@@ -26,6 +34,24 @@ class KatamariEditor:
         self.max_undo = 50
 
         self.entities = []
+        # x/y/z of every entity as one (N, 3) array, row i = self.entities[i].
+        # Rebuilt on load/undo, kept in step on edits through _set_coord.
+        self._xyz = np.empty((0, 3))
+        # Bumped whenever entity positions, ids or the item DB change; keys
+        # caches derived from them (see get_colors)
+        self._entities_version = 0
+        self._color_cache = None
+        self._depths = None  # (entities version, depth per entity), see _hierarchy_depths
+        self._ids_int = None  # (entities version, numeric id per entity), see _id_ints
+        self._sizes = None  # (entities version, item_db size per entity), see _entity_sizes
+        self._parents = None  # (entities version, padded child id -> parent index), see _parent_map
+        self._scatter_artist = None  # entity scatter from the last plot_all, restyled in place
+        self._plane_artist = None  # one face per drawn plane from the last plot_all, see _plane_face_colors
+        self._pending_replot = {}  # callback -> after() id, see _schedule_replot
+        self._hl_background = None  # 3D axes pixels under the highlight markers, see _on_canvas_draw
+        self._last_plot_key = None  # (state key, display mapping, planes) drawn by the last plot_all
+        self._rgba_buf = np.empty((0, 4))  # reused RGBA rows for the entity scatter, see _point_style
+        self._cmaps = {name: getattr(matplotlib.cm, name) for name in ('viridis', 'plasma', 'tab20', 'turbo', 'rainbow')}
         self.item_db = {} 
         self.file_sequence = [] 
         self.display_mapping = [] 
@@ -351,28 +377,28 @@ class KatamariEditor:
         
         tk.Label(self.viz_row1, text="Color:", bg="#ccc", font=("Arial", 8, "bold")).pack(side=tk.LEFT, padx=5)
         for m in ["Standard", "XYZ", "Logic", "ID", "Size", "Hierarchy"]:
-            tk.Radiobutton(self.viz_row1, text=m, variable=self.viz_mode, value=m, bg="#ccc", command=self.plot_all).pack(side=tk.LEFT)
+            tk.Radiobutton(self.viz_row1, text=m, variable=self.viz_mode, value=m, bg="#ccc", command=self._restyle).pack(side=tk.LEFT)
             
         tk.Label(self.viz_row1, text="| Size By CSV:", bg="#ccc", font=("Arial", 8, "bold")).pack(side=tk.LEFT, padx=(10,2))
-        tk.Checkbutton(self.viz_row1, variable=self.use_size_scaling, bg="#ccc", command=self.plot_all).pack(side=tk.LEFT)
+        tk.Checkbutton(self.viz_row1, variable=self.use_size_scaling, bg="#ccc", command=self._restyle).pack(side=tk.LEFT)
 
         self.viz_row2 = tk.Frame(self.tool_frame, bg="#ccc")
         self.viz_row2.pack(fill=tk.X, pady=1)
         
         tk.Label(self.viz_row2, text="Rad:", bg="#ccc").pack(side=tk.LEFT, padx=5)
-        tk.Scale(self.viz_row2, from_=0.1, to=10.0, resolution=0.1, orient=tk.HORIZONTAL, variable=self.color_radius, showvalue=0, bg="#ccc", length=60, command=lambda v: self.plot_all()).pack(side=tk.LEFT)
+        tk.Scale(self.viz_row2, from_=0.1, to=10.0, resolution=0.1, orient=tk.HORIZONTAL, variable=self.color_radius, showvalue=0, bg="#ccc", length=60, command=lambda v: self._schedule_replot(self._restyle)).pack(side=tk.LEFT)
 
         tk.Label(self.viz_row2, text="Alpha:", bg="#ccc").pack(side=tk.LEFT, padx=5)
-        tk.Scale(self.viz_row2, from_=0.0, to=1.0, resolution=0.1, orient=tk.HORIZONTAL, variable=self.entity_opacity, showvalue=0, bg="#ccc", length=60, command=lambda v: self.plot_all()).pack(side=tk.LEFT)
+        tk.Scale(self.viz_row2, from_=0.0, to=1.0, resolution=0.1, orient=tk.HORIZONTAL, variable=self.entity_opacity, showvalue=0, bg="#ccc", length=60, command=lambda v: self._schedule_replot(self._restyle)).pack(side=tk.LEFT)
 
         tk.Label(self.viz_row2, text="Hue:", bg="#ccc").pack(side=tk.LEFT, padx=5)
         self.hue_shift = tk.DoubleVar(value=0.0)
         self.hue_scale = tk.Scale(self.viz_row2, from_=0.0, to=1.0, resolution=0.05, orient=tk.HORIZONTAL, 
                                   variable=self.hue_shift, showvalue=0, bg="#ccc", length=60)
         self.hue_scale.pack(side=tk.LEFT)
-        self.hue_scale.bind("<ButtonRelease-1>", lambda e: self.plot_all())  # Only update on release
+        self.hue_scale.bind("<ButtonRelease-1>", lambda e: self._restyle())  # Only update on release
 
-        tk.Checkbutton(self.viz_row2, text="Depth Fog", variable=self.depth_shading, bg="#ccc", command=self.plot_all).pack(side=tk.LEFT, padx=10)
+        tk.Checkbutton(self.viz_row2, text="Depth Fog", variable=self.depth_shading, bg="#ccc", command=self._restyle).pack(side=tk.LEFT, padx=10)
 
         tk.Button(self.viz_row2, text="⊙ Zoom Fit", command=self.auto_zoom_to_fit, bg="#4CAF50", fg="white", font=("Arial", 8, "bold")).pack(side=tk.LEFT, padx=5)
 
@@ -392,6 +418,7 @@ class KatamariEditor:
         self.canvas.mpl_connect('button_press_event', self.on_mouse_down)
         self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move)
         self.canvas.mpl_connect('button_release_event', self.on_mouse_up)
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
         
         # Keyboard bindings
 
@@ -757,6 +784,7 @@ class KatamariEditor:
         state = self.undo_stack.pop()
         self.entities = state['entities']
         self.file_sequence = state['file_sequence']
+        self._rebuild_coords()
         
         self.on_slice_update()
         self.update_editor_fields()
@@ -953,11 +981,11 @@ class KatamariEditor:
         tk.Checkbutton(size_filter_frame, text="Enable Size Filter", variable=self.size_filter_enabled, bg="#ddd", command=self.on_size_filter_change).pack(anchor="w")
         
         tk.Label(size_filter_frame, text="Min Size:", bg="#ddd").pack(anchor="w")
-        self.scale_size_min = tk.Scale(size_filter_frame, from_=0, to=10000, orient=tk.HORIZONTAL, variable=self.size_filter_min, showvalue=1, resolution=10, command=lambda v: self.on_size_filter_change())
+        self.scale_size_min = tk.Scale(size_filter_frame, from_=0, to=10000, orient=tk.HORIZONTAL, variable=self.size_filter_min, showvalue=1, resolution=10, command=lambda v: self._schedule_replot(self.on_size_filter_change))
         self.scale_size_min.pack(fill=tk.X)
         
         tk.Label(size_filter_frame, text="Max Size:", bg="#ddd").pack(anchor="w")
-        self.scale_size_max = tk.Scale(size_filter_frame, from_=0, to=10000, orient=tk.HORIZONTAL, variable=self.size_filter_max, showvalue=1, resolution=10, command=lambda v: self.on_size_filter_change())
+        self.scale_size_max = tk.Scale(size_filter_frame, from_=0, to=10000, orient=tk.HORIZONTAL, variable=self.size_filter_max, showvalue=1, resolution=10, command=lambda v: self._schedule_replot(self.on_size_filter_change))
         self.scale_size_max.pack(fill=tk.X)
         
         return size_filter_frame
@@ -986,9 +1014,9 @@ class KatamariEditor:
         cb_slice.pack(fill=tk.X, pady=2)
         cb_slice.bind("<<ComboboxSelected>>", self.on_slice_axis_change)
         
-        self.scale_depth = tk.Scale(slice_frame, label="Position", orient=tk.HORIZONTAL, variable=self.slice_depth, showvalue=1, command=lambda v: self.on_slice_update())
+        self.scale_depth = tk.Scale(slice_frame, label="Position", orient=tk.HORIZONTAL, variable=self.slice_depth, showvalue=1, command=lambda v: self._schedule_replot(self.on_slice_update))
         self.scale_depth.pack(fill=tk.X)
-        self.scale_thick = tk.Scale(slice_frame, label="Thickness", from_=0.5, to=75.0, orient=tk.HORIZONTAL, variable=self.slice_thickness, resolution=0.5, command=lambda v: self.on_slice_update())
+        self.scale_thick = tk.Scale(slice_frame, label="Thickness", from_=0.5, to=75.0, orient=tk.HORIZONTAL, variable=self.slice_thickness, resolution=0.5, command=lambda v: self._schedule_replot(self.on_slice_update))
         self.scale_thick.pack(fill=tk.X)
         
         return slice_frame
@@ -1129,10 +1157,8 @@ class KatamariEditor:
         
         ent['r_raw_content'] = "".join(new_parts)
         
-        s, e = "<roll>", "</roll>"
-        si = ent['raw'].find(s) + len(s)
-        ei = ent['raw'].find(e)
-        if si != -1 and ei != -1:
+        if 'roll' in ent['_tag_offsets']:
+            si, ei = ent['_tag_offsets']['roll']
             final_block = ent['r_raw_content'][:ei-si].ljust(ei-si)
             ent['raw'] = ent['raw'][:si] + final_block + ent['raw'][ei:]
 
@@ -1405,9 +1431,9 @@ class KatamariEditor:
             radius = self.pattern_radius.get()
             for idx, entity_idx in enumerate(self.selected_indices[:count]):
                 angle = (2 * math.pi * idx) / count
-                self.entities[entity_idx]['x'] = center_x + radius * math.cos(angle)
-                self.entities[entity_idx]['z'] = center_z + radius * math.sin(angle)
-                self.entities[entity_idx]['y'] = center_y
+                self._set_coord(entity_idx, 'x', center_x + radius * math.cos(angle))
+                self._set_coord(entity_idx, 'z', center_z + radius * math.sin(angle))
+                self._set_coord(entity_idx, 'y', center_y)
                 self._sync_entity_raw(self.entities[entity_idx])
         
         elif ptype == "Line":
@@ -1415,9 +1441,9 @@ class KatamariEditor:
             start_offset = -(count - 1) * spacing / 2
             
             for idx, entity_idx in enumerate(self.selected_indices[:count]):
-                self.entities[entity_idx]['x'] = center_x + start_offset + (idx * spacing)
-                self.entities[entity_idx]['y'] = center_y
-                self.entities[entity_idx]['z'] = center_z
+                self._set_coord(entity_idx, 'x', center_x + start_offset + (idx * spacing))
+                self._set_coord(entity_idx, 'y', center_y)
+                self._set_coord(entity_idx, 'z', center_z)
                 self._sync_entity_raw(self.entities[entity_idx])
         
         elif ptype == "Path":
@@ -1445,9 +1471,9 @@ class KatamariEditor:
                         # Interpolate within this segment
                         local_t = (target_dist - current_dist) / seg_length if seg_length > 0 else 0
                         pos = p1 + local_t * (p2 - p1)
-                        self.entities[entity_idx]['x'] = pos[0]
-                        self.entities[entity_idx]['y'] = pos[1]
-                        self.entities[entity_idx]['z'] = pos[2]
+                        self._set_coord(entity_idx, 'x', pos[0])
+                        self._set_coord(entity_idx, 'y', pos[1])
+                        self._set_coord(entity_idx, 'z', pos[2])
                         break
                     current_dist += seg_length
                 
@@ -1582,7 +1608,7 @@ class KatamariEditor:
             avg = sum(positions) / len(positions)
             
             for idx in self.selected_indices:
-                self.entities[idx][ax] = avg
+                self._set_coord(idx, ax, avg)
                 self._sync_entity_raw(self.entities[idx])
         
         self.update_editor_fields()
@@ -1605,7 +1631,7 @@ class KatamariEditor:
             
             for idx in self.selected_indices:
                 offset = self.entities[idx][ax] - centroid
-                self.entities[idx][ax] = centroid + (offset * factor)
+                self._set_coord(idx, ax, centroid + (offset * factor))
                 self._sync_entity_raw(self.entities[idx])
         
         self.update_editor_fields()
@@ -1652,9 +1678,9 @@ class KatamariEditor:
             rotated = rot_matrix.dot(relative)
             new_pos = centroid + rotated
             
-            self.entities[idx]['x'] = new_pos[0]
-            self.entities[idx]['y'] = new_pos[1]
-            self.entities[idx]['z'] = new_pos[2]
+            self._set_coord(idx, 'x', new_pos[0])
+            self._set_coord(idx, 'y', new_pos[1])
+            self._set_coord(idx, 'z', new_pos[2])
             self._sync_entity_raw(self.entities[idx])
         
         self.update_editor_fields()
@@ -1669,7 +1695,8 @@ class KatamariEditor:
             return
 
         self.save_undo_state("Create Plane")
-        pts = np.array([[self.entities[i]['x'], self.entities[i]['z'], self.entities[i]['y']] for i in self.selected_indices])
+        # Plane space is (x, z, y)
+        pts = self._xyz[self.selected_indices][:, [0, 2, 1]]
         
         centroid = pts.mean(axis=0)
         _, _, vh = np.linalg.svd(pts - centroid)
@@ -1690,10 +1717,9 @@ class KatamariEditor:
         
         # Get bounds for visualization
         if self.entities:
-            xs = [e['x'] for e in self.entities]
-            zs = [e['z'] for e in self.entities]
-            x_min, x_max = min(xs) - 10, max(xs) + 10
-            z_min, z_max = min(zs) - 10, max(zs) + 10
+            (x_min, _, z_min), (x_max, _, z_max) = self._coord_bounds()
+            x_min, x_max = x_min - 10, x_max + 10
+            z_min, z_max = z_min - 10, z_max + 10
         else:
             x_min, x_max = -100, 100
             z_min, z_max = -100, 100
@@ -1726,7 +1752,7 @@ class KatamariEditor:
                 # If it's a Y plane (c is dominant)
                 if abs(c) > 0.9 and abs(a) < 0.1 and abs(b) < 0.1:
                     self.plane_y_value.set(-d / c)
-            self.plot_all()
+            self._update_plane_highlight()
         except tk.TclError:
             pass
 
@@ -1789,29 +1815,45 @@ class KatamariEditor:
             messagebox.showerror("Error", "Plane is parallel to X-axis, cannot snap X values.")
             return
 
-        count = 0
-        for idx in self.selected_indices:
+        sel = np.asarray(self.selected_indices)
+        xs, ys, zs = self._xyz[sel].T
+        # Plane equation: a*x + b*z + c*y + d = 0
+        # Solve for the chosen axis
+        if snap_axis == 'y':
+            vals = -(a * xs + b * zs + d) / c
+        elif snap_axis == 'z':
+            vals = -(a * xs + c * ys + d) / b
+        else:  # x
+            vals = -(b * zs + c * ys + d) / a
+        
+        col = 'xyz'.index(snap_axis)
+        changed = np.abs(self._xyz[sel, col] - vals) > 0.001
+        moved, vals = sel[changed], vals[changed]
+        self._xyz[moved, col] = vals
+        for idx, val in zip(moved, vals):
             ent = self.entities[idx]
-            # Plane equation: a*x + b*z + c*y + d = 0
-            # Solve for the chosen axis
-            if snap_axis == 'y':
-                val = -(a * ent['x'] + b * ent['z'] + d) / c
-            elif snap_axis == 'z':
-                val = -(a * ent['x'] + c * ent['y'] + d) / b
-            else:  # x
-                val = -(b * ent['z'] + c * ent['y'] + d) / a
-                
-            if abs(ent[snap_axis] - val) > 0.001:
-                ent[snap_axis] = val
-                self._sync_entity_raw(ent)
-                count += 1
+            ent[snap_axis] = val
+            self._sync_entity_raw(ent)
+        count = len(moved)
         
         if count > 0:
+            self._entities_version += 1
             self.update_editor_fields()
             self.plot_all()
             self.highlight_pts()
             messagebox.showinfo("Success", f"Snapped {count} entities to plane (moved {snap_axis.upper()}).")
 
+    def _schedule_replot(self, callback):
+        """Run callback ~16ms from now unless a run is already pending, so a slider
+        drag redraws at most once per frame. Callbacks read the current state when
+        they run, so the requests dropped in between lose nothing."""
+        if callback not in self._pending_replot:
+            self._pending_replot[callback] = self.root.after(16, self._do_replot, callback)
+
+    def _do_replot(self, callback):
+        self._pending_replot.pop(callback, None)
+        callback()
+
     def on_size_filter_change(self):
         self.on_slice_update()
 
@@ -1821,46 +1863,41 @@ class KatamariEditor:
         hue_adjustment = self.hue_shift.get()
         if not indices: return np.zeros((0, 3))
         
-        coords = np.array([[self.entities[i]['x'], self.entities[i]['y'], self.entities[i]['z']] for i in indices])
+        # Opacity and depth fog are applied downstream, so dragging those
+        # reuses the last colors
+        key = (mode, rad_scale, hue_adjustment, self._entities_version, len(self.loaded_maps))
+        cached = self._color_cache
+        if cached and cached[0] == key and cached[1] == indices:
+            return cached[2]
+        
+        coords = self._xyz[indices]
         
         if mode == "XYZ":
             z_values = coords[:, 2]
-            z_min, z_max = z_values.min(), z_values.max()
-            rng = (z_max - z_min) if (z_max - z_min) > 0 else 1.0
-            norm_z = np.clip((z_values - z_min) / rng, 0, 1)
-            colors = matplotlib.cm.viridis(norm_z)[:, :3]
+            norm_z = self._normalize_clip(z_values, z_values.min(), z_values.max())
+            colors = self._apply_cmap('viridis', norm_z)
             if hasattr(self, 'loaded_maps') and len(self.loaded_maps) > 1:
                 colors = self.apply_hue_shift(colors, indices)
             
         elif mode == "Logic":
-            logic_pts = np.array([[e['x'], e['y'], e['z']] for e in self.entities if e['id'] == "3226"])
+            logic_pts = self._xyz[[i for i, e in enumerate(self.entities) if e['id'] == "3226"]]
             if len(logic_pts) == 0: 
                 colors = np.array([[0.5, 0.5, 0.5]] * len(indices))
             else:
-                dists = []
-                for p in coords:
-                    d = np.sqrt(np.sum((logic_pts - p)**2, axis=1)).min()
-                    dists.append(d)
-                dists = np.array(dists)
+                dists = self._nearest_distances(coords, logic_pts)
                 max_d = dists.max() if dists.max() > 0 else 1.0
                 effective_range = max_d / max(rad_scale, 0.1)
-                norm_dists = np.clip(1.0 - (dists / effective_range), 0, 1)
-                colors = matplotlib.cm.plasma(norm_dists)[:, :3]
+                dists /= -effective_range
+                dists += 1.0
+                norm_dists = np.clip(dists, 0, 1, out=dists)
+                colors = self._apply_cmap('plasma', norm_dists)
 
         elif mode == "ID":
-            ids = []
-            for i in indices:
-                try: ids.append(int(self.entities[i]['id']))
-                except: ids.append(0)
-            ids = np.array(ids)
-            norm_ids = (ids % 20) / 20.0
-            colors = matplotlib.cm.tab20(norm_ids)[:, :3]
+            norm_ids = (self._id_ints()[indices] % 20) / 20.0
+            colors = self._apply_cmap('tab20', norm_ids)
 
         elif mode == "Size":
-            sizes = []
-            for i in indices:
-                sizes.append(self.get_size_from_db(self.entities[i]))
-            sizes = np.array(sizes)
+            sizes = self._entity_sizes()[indices]
             
             valid_sizes = sizes[(sizes > 0) & (sizes < 50000)]
             
@@ -1869,47 +1906,26 @@ class KatamariEditor:
                 log_min = np.log10(valid_sizes.min())
                 log_max = np.log10(valid_sizes.max())
                 
-                rng = log_max - log_min if log_max > log_min else 1.0
-                norm_sizes = np.clip((log_sizes - log_min) / rng, 0, 1)
+                norm_sizes = self._normalize_clip(log_sizes, log_min, log_max)
                 norm_sizes[sizes >= 50000] = 0.5
             else:
                 norm_sizes = np.zeros_like(sizes, dtype=float)
             
-            colors = matplotlib.cm.turbo(norm_sizes)[:, :3]
+            colors = self._apply_cmap('turbo', norm_sizes)
             colors[sizes >= 50000] = [0.5, 0.5, 0.5]
             
             if hasattr(self, 'loaded_maps') and len(self.loaded_maps) > 1:
                 colors = self.apply_hue_shift(colors, indices)
         
         elif mode == "Hierarchy":
-            parent_map = {}
-            for i, e in enumerate(self.entities):
-                for child_id in e.get('child_ids', []):
-                    clean_id = child_id.strip().zfill(4)
-                    parent_map[clean_id] = i
-            
-            def get_depth(idx):
-                ent_id = self.entities[idx]['id'].strip().zfill(4)
-                depth = 0
-                visited = set()
-                current_id = ent_id
-                
-                while current_id in parent_map and current_id not in visited:
-                    visited.add(current_id)
-                    parent_idx = parent_map[current_id]
-                    current_id = self.entities[parent_idx]['id'].strip().zfill(4)
-                    depth += 1
-                
-                return depth
-            
-            depths = np.array([get_depth(i) for i in indices])
+            depths = self._hierarchy_depths()[indices]
             max_depth = depths.max() if len(depths) > 0 else 0
             
             if max_depth == 0:
                 colors = np.array([[0.3, 0.3, 0.8]] * len(indices))
             else:
                 norm_depths = depths / max_depth
-                colors = matplotlib.cm.rainbow(norm_depths)[:, :3]
+                colors = self._apply_cmap('rainbow', norm_depths)
             
             if hasattr(self, 'loaded_maps') and len(self.loaded_maps) > 1:
                 colors = self.apply_hue_shift(colors, indices)
@@ -1921,8 +1937,102 @@ class KatamariEditor:
         if hue_adjustment != 0:
             colors = self.adjust_hue(colors, hue_adjustment)
         
+        self._color_cache = (key, list(indices), colors)
         return colors
 
+    def _parent_map(self):
+        """Padded child id -> index of the entity listing it as a child,
+        rebuilt only when the entities change."""
+        if self._parents and self._parents[0] == self._entities_version:
+            return self._parents[1]
+        
+        parent_map = {}
+        for i, e in enumerate(self.entities):
+            for child_id in e.get('child_ids', []):
+                parent_map[child_id.strip().zfill(4)] = i
+        self._parents = (self._entities_version, parent_map)
+        return parent_map
+
+    def _hierarchy_depths(self):
+        """Number of parent links above every entity, as an int array. Depth
+        follows ids, so all entities sharing an id share a depth; it is
+        rebuilt only when the entities change."""
+        if self._depths and self._depths[0] == self._entities_version:
+            return self._depths[1]
+        
+        parent_map = self._parent_map()
+        ids = [e['_pid'] for e in self.entities]
+        
+        memo = {}
+        def depth_of(ent_id):
+            path, seen, current_id = [], set(), ent_id
+            while current_id not in memo and current_id in parent_map and current_id not in seen:
+                seen.add(current_id); path.append(current_id)
+                current_id = ids[parent_map[current_id]]
+            if current_id in seen:
+                # The walk looped back on itself; depth is the steps taken,
+                # which depends on where it started, so nothing is memoised
+                return len(path)
+            base = memo.get(current_id, 0)
+            for step, path_id in enumerate(path):
+                memo[path_id] = base + len(path) - step
+            return memo.get(ent_id, base)
+        
+        depths = np.array([depth_of(ent_id) for ent_id in ids], dtype=int)
+        self._depths = (self._entities_version, depths)
+        return depths
+
+    def _id_ints(self):
+        """Entity ids parsed as ints (0 where an id is not numeric), rebuilt
+        only when the entities change."""
+        if self._ids_int and self._ids_int[0] == self._entities_version:
+            return self._ids_int[1]
+        
+        ids = []
+        for e in self.entities:
+            try: ids.append(int(e['id']))
+            except: ids.append(0)
+        ids = np.array(ids, dtype=np.int64)
+        self._ids_int = (self._entities_version, ids)
+        return ids
+
+    def _apply_cmap(self, name, norm):
+        """RGB rows of colormap `name` for values in [0, 1].
+
+        Gathers straight from the colormap's lookup table with the same
+        index rule as Colormap.__call__ (floor(x * N), with 1.0 landing in
+        the last bin), skipping the (N, 4) RGBA result that was only sliced
+        down to RGB.
+        """
+        cmap = self._cmaps[name]
+        if not cmap._isinit:
+            cmap._init()
+        idx = (np.asarray(norm) * cmap.N).astype(int)
+        np.clip(idx, 0, cmap.N - 1, out=idx)
+        return cmap._lut[idx, :3]
+
+    def _normalize_clip(self, vals, lo, hi):
+        """(vals - lo) / (hi - lo) clipped to [0, 1], computed in a single
+        output buffer; an empty or inverted range leaves the offsets unscaled"""
+        out = np.subtract(vals, lo, dtype=float)
+        if hi > lo:
+            out /= (hi - lo)
+        return np.clip(out, 0, 1, out=out)
+
+    def _nearest_distances(self, pts, refs):
+        """Distance from each row of pts to its nearest row of refs, computed
+        by broadcasting over chunks of pts so the (chunk, len(refs), 3)
+        difference array stays around a million elements. Only used for
+        coloring, so the work is done in float32 to halve that array."""
+        pts = pts.astype(np.float32)
+        refs = refs.astype(np.float32)
+        chunk = max(1, (1 << 20) // (3 * len(refs)))
+        out = np.empty(len(pts), dtype=np.float32)
+        for start in range(0, len(pts), chunk):
+            diff = pts[start:start + chunk, None, :] - refs[None, :, :]
+            out[start:start + chunk] = np.einsum('ijk,ijk->ij', diff, diff).min(axis=1)
+        return np.sqrt(out)
+
     def apply_hue_shift(self, colors, indices):
         """Apply hue shift based on which map each entity belongs to"""
         import colorsys
@@ -1961,6 +2071,25 @@ class KatamariEditor:
         db_key = ent['id'].lstrip('0') or '0'
         return self.item_db.get(db_key, {}).get('size_val', 0.0)
 
+    def _entity_sizes(self):
+        """get_size_from_db for every entity as a float array. load_csv bumps the
+        entities version, so this is rebuilt when either the map or the db changes."""
+        if self._sizes and self._sizes[0] == self._entities_version:
+            return self._sizes[1]
+        
+        sizes = np.fromiter((self.get_size_from_db(e) for e in self.entities), dtype=float, count=len(self.entities))
+        self._sizes = (self._entities_version, sizes)
+        return sizes
+
+    def _project_points(self, indices, proj):
+        """Projected (x, y, z) of the given entities under the 3D projection
+        matrix proj, in display axis order (-X, Z, Y). One matrix multiply,
+        same result as proj3d.proj_transform per point."""
+        pts = self._xyz[indices]
+        pts_h = np.column_stack([-pts[:, 0], pts[:, 2], pts[:, 1], np.ones(len(pts))])
+        vecw = pts_h @ proj.T
+        return vecw[:, :3] / vecw[:, 3:4]
+
     def apply_depth_shading(self, base_colors, indices):
         if not self.depth_shading.get() or not self.ax3d.get_visible():
             return base_colors
@@ -1970,36 +2099,22 @@ class KatamariEditor:
         
         # Use camera distance for depth fog instead of raw coordinates
         try:
-            # Get current camera position
-            xs = [self.entities[i]['x'] for i in indices]
-            ys = [self.entities[i]['y'] for i in indices]
-            zs = [self.entities[i]['z'] for i in indices]
-            
-            # Get the 3D to 2D projection
-            proj = self.ax3d.get_proj()
-            
-            # Calculate depth from camera for each point
-            depths = []
-            for i in range(len(indices)):
-                # Transform to display coordinates
-                x2d, y2d, z2d = proj3d.proj_transform(-xs[i], zs[i], ys[i], proj)
-                depths.append(z2d)
-            
-            depths = np.array(depths)
-            if len(depths) == 0: return base_colors
+            depths = self._project_points(indices, self.ax3d.get_proj())[:, 2]
             
             # Normalize depths relative to view
             d_min, d_max = depths.min(), depths.max()
             if d_max == d_min: return base_colors
             
-            fog = (depths - d_min) / (d_max - d_min)
+            # Farther objects are darker: scale = 1 - 0.7 * normalized depth
+            scale = self._normalize_clip(depths, d_min, d_max)
+            scale *= -0.7
+            scale += 1.0
             
             if not isinstance(base_colors, np.ndarray):
                 base_colors = np.array([matplotlib.colors.to_rgb(base_colors)] * len(indices))
             
-            # Apply fog effect - farther objects are darker
-            shaded = base_colors * (1.0 - (fog[:, np.newaxis] * 0.7))
-            return np.clip(shaded, 0, 1)
+            shaded = base_colors * scale[:, np.newaxis]
+            return np.clip(shaded, 0, 1, out=shaded)
         except:
             return base_colors
 
@@ -2019,14 +2134,8 @@ class KatamariEditor:
         if not self.entities:
             return
         
-        xs = [e['x'] for e in self.entities]
-        ys = [e['y'] for e in self.entities]
-        zs = [e['z'] for e in self.entities]
-        
         # Calculate actual data range
-        x_min, x_max = min(xs), max(xs)
-        y_min, y_max = min(ys), max(ys)
-        z_min, z_max = min(zs), max(zs)
+        (x_min, y_min, z_min), (x_max, y_max, z_max) = self._coord_bounds()
         
         # Calculate center
         x_center = (x_min + x_max) / 2
@@ -2063,91 +2172,51 @@ class KatamariEditor:
 
         if not self.entities: 
             self.ax3d.clear()
+            self._scatter_artist = None
+            self._plane_artist = None
+            self.highlights = [None, None, None, None]
+            self._hl_background = None
+            self._last_plot_key = None
             self.canvas.draw()
             return
         
+        active_plane_idx = self._active_plane_selection()
+        
+        # Skip the rebuild when nothing that feeds it changed since the last one
+        # (planes are compared by identity, they are replaced rather than edited)
+        plot_key = (self._entities_version, len(self.loaded_maps), self.viz_mode.get(), self.use_size_scaling.get(),
+                    self.entity_opacity.get(), self.color_radius.get(), self.hue_shift.get(), self.depth_shading.get(),
+                    self.current_theme.get(), self.initial_view_set, self.view_state['3d'], active_plane_idx)
+        last = self._last_plot_key
+        if (last and last[0] == plot_key and last[1] == self.display_mapping
+                and len(last[2]) == len(self.planes) and all(a is b for a, b in zip(last[2], self.planes))):
+            self.highlight_pts()
+            return
+        
         visible_indices = self.display_mapping
         self.ax3d.clear()
+        self._scatter_artist = None
+        self._plane_artist = None
+        self.highlights = [None, None, None, None]
+        self._hl_background = None
 
-        s_vals = 20
-        if self.use_size_scaling.get():
-            sizes = []
-            for i in visible_indices:
-                sv = self.get_size_from_db(self.entities[i])
-                if sv > 9000000: sv = 200
-                sizes.append(sv)
-            if sizes:
-                sizes = np.array(sizes)
-                s_vals = np.clip(sizes / 2.0, 5, 1000)
-            else:
-                s_vals = 20
-
-        colors = self.get_colors(visible_indices)
-        
         if visible_indices:
-            xs = [self.entities[i]['x'] for i in visible_indices]
-            ys = [self.entities[i]['y'] for i in visible_indices]
-            zs = [self.entities[i]['z'] for i in visible_indices]
-            
-            alpha = self.entity_opacity.get()
-            shaded_colors = self.apply_depth_shading(colors, visible_indices)
-            
-            # Prepare size values
-            if isinstance(s_vals, (int, float)):
-                s_vals = np.full(len(visible_indices), float(s_vals))
-            else:
-                s_vals = np.array(s_vals, dtype=float)
+            pts = self._xyz[visible_indices]
+            shaded_colors, alpha, s_vals = self._point_style(visible_indices)
             
             # Draw ALL entities in one scatter (required for correct picking)
-            self.ax3d.scatter([-x for x in xs], zs, ys, 
+            self._scatter_artist = self.ax3d.scatter(-pts[:, 0], pts[:, 2], pts[:, 1], 
                             c=shaded_colors, alpha=alpha, s=s_vals, 
                             picker=True, edgecolors='black', linewidths=0.5)
         
         self.figure.subplots_adjust(left=0, right=1, bottom=0, top=1)
         
-        # Safely get active plane index
-        active_plane_idx = None
-        if hasattr(self, 'plane_listbox') and self.plane_listbox.winfo_exists():
-            try:
-                active_plane_idx = self.plane_listbox.curselection()
-            except tk.TclError:
-                pass
-        
-        for idx, p in enumerate(self.planes):
-            a, b, c, d = p["coeffs"]
-            pts = p["points"]
-            
-            if len(pts) == 0: continue
-            
-            x_min, x_max = pts[:,0].min(), pts[:,0].max()
-            z_min, z_max = pts[:,1].min(), pts[:,1].max()
-            
-            x_range = np.linspace(x_min, x_max, 2)
-            z_range = np.linspace(z_min, z_max, 2)
-            X, Z = np.meshgrid(x_range, z_range)
-            
-            X = -X
-            
-            if abs(c) > 1e-6:
-                Y = -(a*X + b*Z + d) / c
-            elif abs(b) > 1e-6:
-                Y = np.zeros_like(X)
-            else:
-                Y = np.zeros_like(X)
-
-            is_active = (active_plane_idx and active_plane_idx[0] == idx)
-            is_auto = p.get("auto", False)
-            color = 'cyan' if is_auto else ('gold' if is_active else 'gray')
-            p_alpha = 0.2 if is_auto else (0.4 if is_active else 0.1)
-            
-            if is_auto or abs(c) <= 1e-6:
-                flipped_pts = pts.copy()
-                flipped_pts[:,0] = -flipped_pts[:,0]
-                verts = [list(zip(flipped_pts[:,0], flipped_pts[:,1], flipped_pts[:,2]))]
-                poly = Poly3DCollection(verts, alpha=p_alpha, facecolors=color)
-                self.ax3d.add_collection3d(poly)
-            elif abs(c) > 1e-6:
-                self.ax3d.plot_surface(X, Z, Y, color=color, alpha=p_alpha, shade=False)
+        # All planes share one collection, one face each
+        faces = [p["_mesh"] if "_mesh" in p else self._bake_plane(p) for p in self.planes]
+        faces = [f for f in faces if f is not None]
+        if faces:
+            self._plane_artist = Poly3DCollection(faces, facecolors=self._plane_face_colors(active_plane_idx))
+            self.ax3d.add_collection3d(self._plane_artist)
 
         # Restore view state only if it exists and initial view has been set
         if self.view_state['3d'] and self.initial_view_set:
@@ -2161,62 +2230,202 @@ class KatamariEditor:
         self.apply_theme()
         
         self.canvas.draw()
+        self._last_plot_key = (plot_key, list(visible_indices), list(self.planes))
         self.highlight_pts()
 
-    def highlight_pts(self, live_preview=False):
-        """Draw highlight markers for selected entities."""
-        for i, h in enumerate(self.highlights):
-            if h:
-                try: h.remove()
-                except: pass
-                self.highlights[i] = None
+    def _active_plane_selection(self):
+        """curselection() of the plane list, or None when the list is not available."""
+        if hasattr(self, 'plane_listbox') and self.plane_listbox.winfo_exists():
+            try:
+                return self.plane_listbox.curselection()
+            except tk.TclError:
+                pass
+        return None
+
+    def _plane_style(self, p, is_active):
+        """Return (color, alpha) for drawing a plane."""
+        if p.get("auto", False):
+            return 'cyan', 0.2
+        return ('gold', 0.4) if is_active else ('gray', 0.1)
+
+    def _plane_face_colors(self, active_plane_idx):
+        """RGBA for each plane with a mesh, in the order plot_all adds their faces."""
+        return [matplotlib.colors.to_rgba(*self._plane_style(p, active_plane_idx and active_plane_idx[0] == idx))
+                for idx, p in enumerate(self.planes) if p.get("_mesh") is not None]
+
+    def _update_plane_highlight(self):
+        """Recolor the planes from the last plot_all for the current list selection.
+
+        Falls back to plot_all when a plane has not been drawn yet.
+        """
+        drawn = self._last_plot_key
+        if not drawn or len(drawn[2]) != len(self.planes) or not all(a is b for a, b in zip(drawn[2], self.planes)):
+            self.plot_all()
+            return
         
-        if not self.selected_indices: 
-            self.canvas.draw_idle()
+        active_plane_idx = self._active_plane_selection()
+        if self._plane_artist is not None:
+            self._plane_artist.set_facecolor(self._plane_face_colors(active_plane_idx))
+        
+        # Keep plot_all's skip check in step with what is now on screen
+        plot_key, mapping, planes = drawn
+        self._last_plot_key = (plot_key[:-1] + (active_plane_idx,), mapping, planes)
+        self.canvas.draw_idle()
+
+    def _bake_plane(self, p):
+        """Compute a plane's display polygon once and keep it on the plane as p["_mesh"].
+
+        Planes are never edited after creation (a new slice replaces its auto plane),
+        so redraws only pick colors. Returns the polygon's (x, z, y) vertices, or None
+        for a plane without points. A fitted plane is the quad over its points' extent.
+        """
+        a, b, c, d = p["coeffs"]
+        pts = p["points"]
+        
+        if len(pts) == 0:
+            mesh = None
+        elif p.get("auto", False) or abs(c) <= 1e-6:
+            mesh = list(zip(-pts[:,0], pts[:,1], pts[:,2]))
+        else:
+            x_range = np.linspace(pts[:,0].min(), pts[:,0].max(), 2)
+            z_range = np.linspace(pts[:,1].min(), pts[:,1].max(), 2)
+            X, Z = np.meshgrid(x_range, z_range)
+            X = -X
+            Y = -(a*X + b*Z + d) / c
+            mesh = [(X[i, j], Z[i, j], Y[i, j]) for i, j in ((0, 0), (0, 1), (1, 1), (1, 0))]
+        
+        p["_mesh"] = mesh
+        return mesh
+
+    def _point_style(self, visible_indices):
+        """Return (RGBA colors, alpha, sizes) for the entity scatter.
+
+        The colors are a view into self._rgba_buf, which is only grown when more
+        entities are visible, so callers must hand them to matplotlib (which copies)
+        rather than keep them.
+        """
+        s_vals = 20
+        if self.use_size_scaling.get() and len(visible_indices):
+            sizes = self._entity_sizes()[visible_indices]
+            sizes = np.where(sizes > 9000000, 200, sizes)
+            s_vals = np.clip(sizes / 2.0, 5, 1000)
+
+        colors = self.get_colors(visible_indices)
+        shaded_colors = self.apply_depth_shading(colors, visible_indices)
+        alpha = self.entity_opacity.get()
+        
+        n = len(visible_indices)
+        if len(self._rgba_buf) < n:
+            self._rgba_buf = np.empty((max(n, len(self.entities)), 4))
+        rgba = self._rgba_buf[:n]
+        rgba[:, :3] = shaded_colors
+        rgba[:, 3] = alpha
+        
+        # Prepare size values
+        if isinstance(s_vals, (int, float)):
+            s_vals = np.full(n, float(s_vals))
+        else:
+            s_vals = np.array(s_vals, dtype=float)
+        return rgba, alpha, s_vals
+
+    def _restyle(self):
+        """Update colors/alpha/sizes of the existing scatter instead of rebuilding the axes.
+
+        Only for style changes; anything that changes which entities are shown goes through plot_all.
+        """
+        art = self._scatter_artist
+        if art is None or not self.display_mapping:
+            self.plot_all()
             return
         
-        xs, ys, zs = [], [], []
-        off = self.offset_mode.get()
-        p_vals = [v.get() for v in self.pos_vars]
+        shaded_colors, alpha, s_vals = self._point_style(self.display_mapping)
+        art.set_facecolor(shaded_colors)
+        art.set_alpha(alpha)
+        art.set_sizes(s_vals)
+        # Path3DCollection re-sorts from its own copies on every draw
+        if hasattr(art, '_facecolor3d'):
+            art._facecolor3d = art.get_facecolor()
+            art._edgecolor3d = art.get_edgecolor()
+        if hasattr(art, '_sizes3d'):
+            art._sizes3d = art.get_sizes()
+        self.canvas.draw_idle()
+
+    def highlight_pts(self, live_preview=False):
+        """Draw highlight markers for selected entities.
+        
+        The two marker layers are created once per plot_all (which clears the axes)
+        and afterwards only have their offsets moved. They are animated artists, so
+        an update blits them over the last full draw instead of redrawing the scene.
+        """
+        sel = [i for i in self.selected_indices if i < len(self.entities)]
+        if not (sel and self.ax3d.get_visible()):
+            for h in self.highlights[:2]:
+                if h: h.set_visible(False)
+            self._blit_highlights()
+            return
         
-        for i in self.selected_indices:
-            if i >= len(self.entities):
-                continue
-            e = self.entities[i]
-            if live_preview:
-                px = (e['x'] - p_vals[0]) if off else -p_vals[0]
-                py = (e['y'] - p_vals[1]) if off else -p_vals[1]
-                pz = (e['z'] - p_vals[2]) if off else -p_vals[2]
+        pts = self._xyz[sel]
+        if live_preview:
+            p_vals = np.array([v.get() for v in self.pos_vars])
+            if self.offset_mode.get():
+                pts = pts - p_vals
             else:
-                px, py, pz = e['x'], e['y'], e['z']
-            xs.append(px); ys.append(py); zs.append(pz)
-            
-        if self.ax3d.get_visible() and xs:
+                pts = np.broadcast_to(-p_vals, pts.shape)
+        xs, ys, zs = pts.T
+        
+        if self.highlights[0] and self.highlights[1]:
+            for h in self.highlights[:2]:
+                h._offsets3d = (-xs, zs, ys)
+                h.set_visible(True)
+        else:
             # Layer 1: Yellow outer ring (outline around entity)
             self.highlights[0] = self.ax3d.scatter(
-                [-x for x in xs], zs, ys, 
+                -xs, zs, ys, 
                 c='none',
                 s=250,
                 marker='o',
                 edgecolors='#FFD700',  # Gold/yellow
                 linewidths=3, 
                 depthshade=False,
-                alpha=0.9
+                alpha=0.9,
+                animated=True
             )
             
             # Layer 2: Red circle (slightly smaller, inside the yellow)
             self.highlights[1] = self.ax3d.scatter(
-                [-x for x in xs], zs, ys, 
+                -xs, zs, ys, 
                 c='none',
                 s=150,
                 marker='o',
                 edgecolors='#CC0000',  # Darker red, less harsh
                 linewidths=2.5, 
                 depthshade=False,
-                alpha=0.9
+                alpha=0.9,
+                animated=True
             )
             
-        self.canvas.draw_idle()
+        self._blit_highlights()
+
+    def _on_canvas_draw(self, event):
+        """After every full draw: keep the 3D axes without the highlight markers as
+        the background for _blit_highlights, then paint the markers over it."""
+        self._hl_background = self.canvas.copy_from_bbox(self.ax3d.bbox)
+        self._draw_highlights()
+
+    def _draw_highlights(self):
+        for h in self.highlights[:2]:
+            if h and h.get_visible():
+                h.do_3d_projection()
+                self.ax3d.draw_artist(h)
+
+    def _blit_highlights(self):
+        if self._hl_background is None:
+            # Nothing drawn since the axes were cleared; the draw will paint them
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._hl_background)
+        self._draw_highlights()
+        self.canvas.blit(self.ax3d.bbox)
 
     def swap_positions(self):
         if len(self.selected_indices) != 2:
@@ -2226,10 +2435,27 @@ class KatamariEditor:
         idx1, idx2 = self.selected_indices
         e1, e2 = self.entities[idx1], self.entities[idx2]
         p1 = (e1['x'], e1['y'], e1['z']); p2 = (e2['x'], e2['y'], e2['z'])
-        e1['x'], e1['y'], e1['z'] = p2; e2['x'], e2['y'], e2['z'] = p1
+        for ax, v1, v2 in zip('xyz', p1, p2):
+            self._set_coord(idx1, ax, v2); self._set_coord(idx2, ax, v1)
         self._sync_entity_raw(e1); self._sync_entity_raw(e2)
         self.update_editor_fields(); self.plot_all(); self.highlight_pts()
 
+    def _rebuild_coords(self):
+        """Rebuild self._xyz from the entity dicts"""
+        self._xyz = np.array([(e['x'], e['y'], e['z']) for e in self.entities], dtype=float).reshape(-1, 3)
+        self._entities_version += 1
+
+    def _coord_bounds(self):
+        """((x_min, y_min, z_min), (x_max, y_max, z_max)) over all entities, as floats"""
+        return tuple(self._xyz.min(axis=0).tolist()), tuple(self._xyz.max(axis=0).tolist())
+
+    def _set_coord(self, idx, axis, val):
+        """Set one coordinate ('x', 'y' or 'z') of an entity, keeping
+        self._xyz in step with the dict"""
+        self.entities[idx][axis] = val
+        self._xyz[idx, 'xyz'.index(axis)] = val
+        self._entities_version += 1
+
     def _sync_entity_raw(self, ent):
         original_content = ent['p_raw_content']
         new_parts, last_idx, ax_keys = [], 0, ['x', 'y', 'z']
@@ -2241,8 +2467,7 @@ class KatamariEditor:
         new_parts.append(original_content[last_idx:])
         reconstructed = "".join(new_parts)
         ent['p_raw_content'] = reconstructed
-        s, e = "<posi>", "</posi>"
-        si = ent['raw'].find(s) + len(s); ei = ent['raw'].find(e)
+        si, ei = ent['_tag_offsets']['posi']
         final_block = reconstructed[:ei-si].ljust(ei-si)
         ent['raw'] = ent['raw'][:si] + final_block + ent['raw'][ei:]
 
@@ -2257,52 +2482,74 @@ class KatamariEditor:
                 s.configure(from_=-limit, to=limit)
 
     def _parse_block(self, b):
-        def get_t(t, src):
-            m = re.search(fr'<{t}>(.*?)</{t}>', src, re.DOTALL)
-            return (m.group(1), len(m.group(1))) if m else ("", 0)
-        def find_val(tags, src):
+        # One left-to-right walk with str.find: for each known tag, the text
+        # between its first <tag> and the first </tag> after that, and where
+        # that text sits in the block (every later rewrite of raw keeps widths)
+        found, spans = {}, {}
+        pos = b.find('<')
+        while pos != -1:
+            if b.startswith('/', pos + 1):
+                # Closing tag, never one we look up
+                pos = b.find('<', pos + 2); continue
+            end = b.find('>', pos + 1)
+            if end == -1: break
+            t = b[pos + 1:end]
+            if t in _BLOCK_TAGS and t not in found:
+                close = b.find(f'</{t}>', end + 1)
+                if close != -1:
+                    found[t] = b[end + 1:close]; spans[t] = (end + 1, close)
+            pos = b.find('<', pos + 1)
+        
+        def get_t(t):
+            v = found.get(t)
+            return (v, len(v)) if v is not None else ("", 0)
+        def find_val(tags):
             for t in tags:
-                m = re.search(fr'<{t}>(.*?)</{t}>', src, re.DOTALL)
-                if m: return m.group(1).strip()
+                if t in found: return found[t].strip()
             return "0"
-        p_raw, p_len = get_t('posi', b)
-        p_matches = list(re.finditer(r'[^\s]+', p_raw))
-        if len(p_matches) == 3:
-            p = [float(m.group(0)) for m in p_matches]
-            p_indices = [(m.start(), m.end()) for m in p_matches]
+        def tokens(raw):
+            # Whitespace-separated values with their (start, end) in raw
+            toks, spans, i = raw.split(), [], 0
+            for tok in toks:
+                i = raw.find(tok, i)
+                spans.append((i, i + len(tok))); i += len(tok)
+            return toks, spans
+        p_raw, p_len = get_t('posi')
+        p_toks, p_indices = tokens(p_raw)
+        if len(p_toks) == 3:
+            p = [float(v) for v in p_toks]
         else: p = [0.0, 0.0, 0.0]; p_indices = []
-        r_raw, r_len = get_t('roll', b)
-        r_matches = list(re.finditer(r'[^\s]+', r_raw))
-        if len(r_matches) == 4:
-            r = [float(m.group(0)) for m in r_matches]
-            r_indices = [(m.start(), m.end()) for m in r_matches]
+        r_raw, r_len = get_t('roll')
+        r_toks, r_indices = tokens(r_raw)
+        if len(r_toks) == 4:
+            r = [float(v) for v in r_toks]
         else: r = [0.0, 0.0, 0.0, 1.0]; r_indices = []
-        id_raw, id_len = get_t('index', b)
+        id_raw, id_len = get_t('index')
         
         return {
-            'raw': b, 'p_raw_content': p_raw, 'r_raw_content': r_raw,
+            'raw': b, '_tag_offsets': spans, 'p_raw_content': p_raw, 'r_raw_content': r_raw,
             'p_indices': p_indices, 'r_indices': r_indices,
             'id_tag_len': id_len, 'x': p[0], 'y': p[1], 'z': p[2], 
             'rx': r[0], 'ry': r[1], 'rz': r[2], 'rw': r[3],
-            'id': id_raw.strip(), 'pack': get_t('pack_id', b)[0].strip(), 
-            'atk': get_t('attack_type', b)[0].strip(), 'mov': get_t('move_type', b)[0].strip(), 
-            'esc': get_t('escape_type', b)[0].strip(), 'spd': find_val(['move_speed', 'speed'], b), 
-            'pth': find_val(['move_path_id', 'path_id'], b),
-            'scale': find_val(['scale'], b),
-            'plus_type': find_val(['plus_type'], b),
-            'plus_fly_height': find_val(['plus_fly_height'], b),
-            'plus_roll_speed': find_val(['plus_roll_speed'], b),
-            'plus_angle': find_val(['plus_angle'], b),
-            'parent_type': find_val(['parent_type'], b),
-            'clash_type': find_val(['clash_type'], b),
+            'id': id_raw.strip(), '_pid': id_raw.strip().zfill(4), 'pack': get_t('pack_id')[0].strip(), 
+            'atk': get_t('attack_type')[0].strip(), 'mov': get_t('move_type')[0].strip(), 
+            'esc': get_t('escape_type')[0].strip(), 'spd': find_val(['move_speed', 'speed']), 
+            'pth': find_val(['move_path_id', 'path_id']),
+            'scale': find_val(['scale']),
+            'plus_type': find_val(['plus_type']),
+            'plus_fly_height': find_val(['plus_fly_height']),
+            'plus_roll_speed': find_val(['plus_roll_speed']),
+            'plus_angle': find_val(['plus_angle']),
+            'parent_type': find_val(['parent_type']),
+            'clash_type': find_val(['clash_type']),
             'child_ids': []
         }
 
     def format_strict(self, val, width):
-        s = f"{val:.10f}"
-        if len(s) > width:
-            s = s[:width]
-            if s.endswith('.'): s = s[:-1].rjust(width)
+        # Digits past the field are cut, not rounded, so this stays a plain
+        # slice; a '.' can only end the text when the slice cut it there
+        s = f"{val:.10f}"[:width]
+        if s[-1:] == '.': return s[:-1].rjust(width)
         return s.ljust(width)
 
     def commit_batch_changes(self):
@@ -2313,9 +2560,8 @@ class KatamariEditor:
         for idx in self.selected_indices:
             ent = self.entities[idx]; raw = ent['raw']
             def safe_rep(tag, new_content, block):
-                s, e = f"<{tag}>", f"</{tag}>"
-                si = block.find(s) + len(s); ei = block.find(e)
-                if si == -1 or ei == -1: return block
+                if tag not in ent['_tag_offsets']: return block
+                si, ei = ent['_tag_offsets'][tag]
                 orig_len = ei - si
                 final_str = new_content[:orig_len].ljust(orig_len)
                 return block[:si] + final_str + block[ei:]
@@ -2328,9 +2574,9 @@ class KatamariEditor:
                     if f"pos_{i}" in self.dirty_fields:
                         file_val = -vals['pos'][i]
                         if use_offset:
-                            ent[ax_keys[i]] = ent[ax_keys[i]] + file_val
+                            self._set_coord(idx, ax_keys[i], ent[ax_keys[i]] + file_val)
                         else:
-                            ent[ax_keys[i]] = file_val
+                            self._set_coord(idx, ax_keys[i], file_val)
                     new_parts.append(self.format_strict(ent[ax_keys[i]], end - start))
                     last_idx = end
                 new_parts.append(original_content[last_idx:])
@@ -2346,10 +2592,12 @@ class KatamariEditor:
                     if f == 'id':
                         target_w = ent['id_tag_len'] - 2
                         val_str = val_str.zfill(target_w); id_changed = True
+                        ent['_pid'] = val_str.zfill(4)
                     ent[f] = val_str
                     raw = safe_rep(t, f" {val_str} ", raw)
             ent['raw'] = raw
         self.dirty_fields.clear()
+        self._entities_version += 1
         
         if use_offset:
             for v in self.pos_vars:
@@ -2371,18 +2619,25 @@ class KatamariEditor:
     def on_slice_update(self):
         if not self.entities: return
         mode = self.slice_axis.get()
-        if mode == "None": 
-            visible = list(range(len(self.entities)))
-        else:
+        # Build the visibility as one boolean mask over the position/size arrays
+        mask = np.ones(len(self.entities), dtype=bool)
+        if mode != "None":
             tax = 'y' if "Y-Axis" in mode else ('z' if "Z-Axis" in mode else 'x')
             d, t = self.slice_depth.get(), self.slice_thickness.get()
-            visible = [i for i, e in enumerate(self.entities) if (d-t) <= e[tax] <= (d+t)]
+            vals = self._xyz[:, 'xyz'.index(tax)]
+            mask &= (vals >= d - t) & (vals <= d + t)
         
         if self.size_filter_enabled.get():
             size_min = self.size_filter_min.get()
             size_max = self.size_filter_max.get()
-            visible = [i for i in visible if size_min <= self.get_size_from_db(self.entities[i]) <= size_max]
+            sizes = self._entity_sizes()
+            mask &= (sizes >= size_min) & (sizes <= size_max)
+        
+        # display_mapping stays a list of ints (it is tested for truth and compared by value)
+        visible = np.flatnonzero(mask).tolist()
         
+        # Only the last plane can be kept in place, see below
+        prev_auto = self.planes[-1] if self.planes and self.planes[-1].get("auto", False) else None
         self.planes = [p for p in self.planes if not p.get("auto", False)]
         
         if mode != "None":
@@ -2417,8 +2672,13 @@ class KatamariEditor:
                     [depth, zb[0], yb[1]]
                 ])
 
-            self.planes.append({"name": "Slice Plane [Auto]", "coeffs": coeffs, "points": pts, "auto": True})
-            self.refresh_plane_list()
+            if prev_auto is not None and prev_auto["coeffs"] == coeffs and np.array_equal(prev_auto["points"], pts):
+                # Same slice plane (only thickness or the size filter moved): keep the
+                # object, so its baked mesh stays valid and the plane list needs no refresh
+                self.planes.append(prev_auto)
+            else:
+                self.planes.append({"name": "Slice Plane [Auto]", "coeffs": coeffs, "points": pts, "auto": True})
+                self.refresh_plane_list()
 
         self.display_mapping = visible
         self.refresh_list(); self.plot_all(); self.highlight_pts()
@@ -2462,17 +2722,22 @@ class KatamariEditor:
 
     def do_paint_select(self, event):
         rad = self.brush_size.get(); ctrl = (event.key == 'control'); changed = False
-        if event.inaxes == self.ax3d:
-            proj_matrix = self.ax3d.get_proj()
-            for midx in self.display_mapping:
-                e = self.entities[midx]
-                x2d, y2d, _ = proj3d.proj_transform(-e['x'], e['z'], e['y'], proj_matrix)
-                disp_coord = self.ax3d.transData.transform((x2d, y2d))
-                pixel_dist = math.sqrt((disp_coord[0]-event.x)**2 + (disp_coord[1]-event.y)**2)
-                if pixel_dist < rad:
-                    if ctrl and midx in self.selected_indices: self.selected_indices.remove(midx); changed = True
-                    elif not ctrl and midx not in self.selected_indices: self.selected_indices.append(midx); changed = True
-        if changed: self.sync_selection_ui()
+        if event.inaxes == self.ax3d and self.display_mapping:
+            proj_xy = self._project_points(self.display_mapping, self.ax3d.get_proj())[:, :2]
+            disp = self.ax3d.transData.transform(proj_xy)
+            dx = disp[:, 0] - event.x; dy = disp[:, 1] - event.y
+            hits = [self.display_mapping[i] for i in np.flatnonzero(dx*dx + dy*dy < rad*rad)]
+            if ctrl:
+                hit_set = set(hits)
+                kept = [i for i in self.selected_indices if i not in hit_set]
+                changed = len(kept) != len(self.selected_indices)
+                self.selected_indices = kept
+            else:
+                sel_set = set(self.selected_indices)
+                for midx in hits:
+                    if midx not in sel_set:
+                        self.selected_indices.append(midx); sel_set.add(midx); changed = True
+        if changed: self._schedule_replot(self.sync_selection_ui)
 
     def sync_selection_ui(self):
         self.is_updating_ui = True
@@ -2497,20 +2762,33 @@ class KatamariEditor:
 
     def on_slider_move(self, t):
         if not self.is_updating_ui and self.selected_indices: 
+            self._schedule_replot(self._highlight_live)
+
+    def _highlight_live(self):
+        if self.selected_indices:
             self.highlight_pts(live_preview=True)
 
     def sort_entities(self, crit):
         self.sort_reverse = (not self.sort_reverse) if self.last_sort == crit else False
         self.last_sort = crit
-        def sk(idx):
-            e = self.entities[idx]; db_key = e['id'].lstrip('0') or '0'
-            info = self.item_db.get(db_key) or {}
-            if crit == "NAME": return "logic" if e['id'] == "3226" else info.get('name','').lower()
-            if crit == "SIZE": return info.get('size_val', 0)
-            if crit == "ATK": return int(e.get('atk', 0))
-            if crit == "MOV": return int(e.get('mov', 0))
-            return e['id']
-        self.display_mapping.sort(key=sk, reverse=self.sort_reverse)
+        dm = np.asarray(self.display_mapping, dtype=int)
+        if crit == "SIZE":
+            keys = self._entity_sizes()[dm]
+        elif crit in ("ATK", "MOV"):
+            f = crit.lower()
+            keys = np.array([int(self.entities[i].get(f, 0)) for i in dm], dtype=np.int64)
+        else:
+            def sk(e):
+                if crit != "NAME": return e['id']
+                if e['id'] == "3226": return "logic"
+                return (self.item_db.get(e['id'].lstrip('0') or '0') or {}).get('name','').lower()
+            labels = [sk(self.entities[i]) for i in dm]
+            # Strings sort through their rank among the distinct labels
+            rank = {s: r for r, s in enumerate(sorted(set(labels)))}
+            keys = np.array([rank[s] for s in labels], dtype=np.int64)
+        # Negating instead of reversing keeps ties in list order, like sort(reverse=True)
+        order = np.argsort(-keys if self.sort_reverse else keys, kind='stable')
+        self.display_mapping = dm[order].tolist()
         self.refresh_list()
         self.plot_all()
 
@@ -2522,7 +2800,8 @@ class KatamariEditor:
         p = filedialog.askopenfilename(filetypes=[("CSV","*.csv")])
         if p:
             with open(p, 'r', encoding='utf-8-sig') as f:
-                self.item_db = {r['ID'].strip().lstrip('0'): {'name': r['NAME'], 'size_val': float(re.sub(r'[^\d.]', '', r['SIZE (mm)'])) if r.get('SIZE (mm)') else 0} for r in csv.DictReader(f)}
+                self.item_db = {r['ID'].strip().lstrip('0'): {'name': r['NAME'], 'size_val': float(_SIZE_JUNK_RE.sub('', r['SIZE (mm)'])) if r.get('SIZE (mm)') else 0} for r in csv.DictReader(f)}
+            self._entities_version += 1
             
             if self.item_db and hasattr(self, 'scale_size_max'):
                 sizes = [info['size_val'] for info in self.item_db.values() if info['size_val'] < 9000000]
@@ -2565,19 +2844,19 @@ class KatamariEditor:
         map_entities = []
         map_sequence = []
         
-        token_pattern = re.compile(r'(<entity>|</entity>|<child>|</child>)')
-        
         last_pos = 0
         entity_start_pos = None
         parent_stack = []
+        # Bound once, these run for every token of the file
+        seq_append, map_append, ents_append = map_sequence.append, map_entities.append, self.entities.append
         
-        for match in token_pattern.finditer(content):
+        for match in _TOKEN_RE.finditer(content):
             token = match.group(1)
-            start, end = match.start(), match.end()
+            start, end = match.span()
             
             if entity_start_pos is None:
                 if start > last_pos:
-                    map_sequence.append(content[last_pos:start])
+                    seq_append(content[last_pos:start])
             
             if token == "<entity>":
                 entity_start_pos = start
@@ -2589,14 +2868,14 @@ class KatamariEditor:
                     ent['child_ids'] = []
                     ent['map_index'] = len(self.loaded_maps)
                     ent['map_name'] = map_name
-                    map_entities.append(ent)
-                    self.entities.append(ent)
-                    map_sequence.append(ent)
+                    map_append(ent)
+                    ents_append(ent)
+                    seq_append(ent)
                     
                     parent_stack.append(len(self.entities) - 1)
                     entity_start_pos = None
                 
-                map_sequence.append(token)
+                seq_append(token)
             
             elif token == "</entity>":
                 if entity_start_pos is not None:
@@ -2605,26 +2884,27 @@ class KatamariEditor:
                     ent['child_ids'] = []
                     ent['map_index'] = len(self.loaded_maps)
                     ent['map_name'] = map_name
-                    map_entities.append(ent)
-                    self.entities.append(ent)
-                    map_sequence.append(ent)
+                    map_append(ent)
+                    ents_append(ent)
+                    seq_append(ent)
                     
                     if parent_stack:
                         self.entities[parent_stack[-1]]['child_ids'].append(ent['id'])
                     
                     entity_start_pos = None
                 else:
-                    map_sequence.append(token)
+                    seq_append(token)
             
             elif token == "</child>":
-                map_sequence.append(token)
+                seq_append(token)
                 if parent_stack:
                     parent_stack.pop()
 
             last_pos = end
 
         if last_pos < len(content):
-            map_sequence.append(content[last_pos:])
+            seq_append(content[last_pos:])
+        self._rebuild_coords()
         
         # Calculate hue offset for this map
         hue_offset = len(self.loaded_maps) * 0.15  # 15% hue shift per map
@@ -2654,10 +2934,10 @@ class KatamariEditor:
             self.root.title(f"Katamari Editor 19.3 - {map_names}")
         
         if self.entities:
-            xs, ys, zs = [e['x'] for e in self.entities], [e['y'] for e in self.entities], [e['z'] for e in self.entities]
-            self.axis_bounds = {'x':(min(xs), max(xs)), 'y':(min(ys), max(ys)), 'z':(min(zs), max(zs))}
+            (x_min, y_min, z_min), (x_max, y_max, z_max) = self._coord_bounds()
+            self.axis_bounds = {'x':(x_min, x_max), 'y':(y_min, y_max), 'z':(z_min, z_max)}
             
-            max_range = max(max(xs)-min(xs), max(ys)-min(ys), max(zs)-min(zs), 10.0)
+            max_range = max(x_max-x_min, y_max-y_min, z_max-z_min, 10.0)
             auto_limit = max_range * 0.6
             self.pos_limit.set(auto_limit)
             
@@ -2669,11 +2949,6 @@ class KatamariEditor:
             
             # Set initial 3D view to fit all entities (only on first load)
             if not self.initial_view_set or not is_primary:
-                # Calculate actual data range
-                x_min, x_max = min(xs), max(xs)
-                y_min, y_max = min(ys), max(ys)
-                z_min, z_max = min(zs), max(zs)
-                
                 # Calculate center
                 x_center = (x_min + x_max) / 2
                 y_center = (y_min + y_max) / 2
@@ -2702,6 +2977,25 @@ class KatamariEditor:
         if not is_primary:
             self.lbl_info.config(text=f"Added map: {map_name} ({len(map_entities)} entities)")
 
+    def _sequence_bytes(self, sequence):
+        """UTF-8 file contents for a file_sequence, built in one bytearray.
+
+        Each entity keeps the encoding of its raw text as ent['_raw_bytes'] =
+        (raw, bytes); any edit replaces ent['raw'] with a new string, so only
+        blocks changed since the last save are encoded again.
+        """
+        buf = bytearray()
+        for item in sequence:
+            if isinstance(item, str):
+                buf += item.encode('utf-8')
+                continue
+            raw = item['raw']
+            cached = item.get('_raw_bytes')
+            if cached is None or cached[0] is not raw:
+                cached = item['_raw_bytes'] = (raw, raw.encode('utf-8'))
+            buf += cached[1]
+        return buf
+
     def save_all_maps(self):
         """Save all loaded maps to their original files"""
         if not self.loaded_maps:
@@ -2712,9 +3006,9 @@ class KatamariEditor:
         for map_data in self.loaded_maps:
             try:
                 # Reconstruct this map's file from its entities
-                out = "".join([i if isinstance(i, str) else i['raw'] for i in map_data['file_sequence']])
+                out = self._sequence_bytes(map_data['file_sequence'])
                 with open(map_data['filepath'], 'wb') as f:
-                    f.write(out.encode('utf-8'))
+                    f.write(out)
                 saved_count += 1
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save {map_data['name']}: {e}")
@@ -2731,13 +3025,11 @@ class KatamariEditor:
         self.undo_stack = []
         self.update_undo_button()
         
-        token_pattern = re.compile(r'(<entity>|</entity>|<child>|</child>)')
-        
         last_pos = 0
         entity_start_pos = None
         parent_stack = []
         
-        for match in token_pattern.finditer(content):
+        for match in _TOKEN_RE.finditer(content):
             token = match.group(1)
             start, end = match.start(), match.end()
             
@@ -2835,11 +3127,7 @@ class KatamariEditor:
     def refresh_list(self):
         self.entity_listbox.delete(0, tk.END)
         
-        parent_map = {}
-        for i, e in enumerate(self.entities):
-            for child_id in e.get('child_ids', []):
-                padded_id = child_id.strip().zfill(4)
-                parent_map[padded_id] = i
+        parent_map = self._parent_map()
         
         is_default_sort = (self.display_mapping == list(range(len(self.entities))))
         
@@ -2850,8 +3138,7 @@ class KatamariEditor:
             name = "Logic" if e['id'] == "3226" else info.get('name','Unknown')
             size = info.get('size_val','?')
             
-            padded_current_id = e['id'].strip().zfill(4)
-            is_child = padded_current_id in parent_map
+            is_child = e['_pid'] in parent_map
             
             if is_default_sort and is_child:
                 prefix = "    "
@@ -2870,16 +3157,11 @@ class KatamariEditor:
         info = self.item_db.get(db_key) or {}
         name = "Logic" if ent['id'] == "3226" else info.get('name','Unknown')
         
-        parent_map = {}
-        for i, e in enumerate(self.entities):
-            for child_id in e.get('child_ids', []):
-                padded_id = child_id.strip().zfill(4)
-                parent_map[padded_id] = i
+        parent_map = self._parent_map()
         
         rel_info = ""
-        padded_current_id = ent['id'].strip().zfill(4)
-        if padded_current_id in parent_map:
-            parent_idx = parent_map[padded_current_id]
+        if ent['_pid'] in parent_map:
+            parent_idx = parent_map[ent['_pid']]
             parent_e = self.entities[parent_idx]
             parent_db_key = parent_e['id'].lstrip('0') or '0'
             parent_info = self.item_db.get(parent_db_key) or {}
@@ -2931,8 +3213,8 @@ class KatamariEditor:
             # No loaded_maps - use legacy file_sequence
             p = filedialog.asksaveasfilename(defaultextension=".dat")
             if p:
-                out = "".join([i if isinstance(i, str) else i['raw'] for i in self.file_sequence])
-                with open(p, 'wb') as f: f.write(out.encode('utf-8'))
+                out = self._sequence_bytes(self.file_sequence)
+                with open(p, 'wb') as f: f.write(out)
                 messagebox.showinfo("Success", "Saved.")
     
     def _save_single_map(self, map_idx, dialog=None):
@@ -2952,9 +3234,9 @@ class KatamariEditor:
             return
         
         # Reconstruct this map's file from its file_sequence
-        out = "".join([i if isinstance(i, str) else i['raw'] for i in map_data['file_sequence']])
+        out = self._sequence_bytes(map_data['file_sequence'])
         with open(p, 'wb') as f: 
-            f.write(out.encode('utf-8'))
+            f.write(out)
         messagebox.showinfo("Success", f"Saved {map_data['name']}.")
 
 if __name__ == "__main__":